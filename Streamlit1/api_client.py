@@ -6,6 +6,7 @@ including automatic token refresh, retry logic, and comprehensive error handling
 """
 
 import requests
+import sys
 import time
 import json
 import logging
@@ -531,13 +532,16 @@ class DataspherAPIClient:
         for dep_data in data.get('dependencies', []):
             dependencies.append(self._parse_lineage_node(dep_data))
 
+        # Kinds and dependency types repeat across the whole tree; interned,
+        # every node shares one string and set lookups compare by identity
+        dependency_type = data.get('dependencyType')
         return LineageNode(
             id=data.get('id', ''),
             qualified_name=data.get('qualifiedName', ''),
             name=data.get('name', data.get('qualifiedName', '')),
-            kind=data.get('kind', 'unknown'),
+            kind=sys.intern(data.get('kind', 'unknown')),
             folder_id=data.get('folderId', ''),
-            dependency_type=data.get('dependencyType'),
+            dependency_type=sys.intern(dependency_type) if dependency_type else dependency_type,
             hash=data.get('hash'),
             impact=data.get('impact', False),
             lineage=data.get('lineage', True),
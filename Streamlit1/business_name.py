@@ -24,17 +24,19 @@ def get_business_and_technical_name(artifact):
         AND A.ARTIFACT_VERSION = B.MAX_ARTIFACT_VERSION;
     '''
     csn_files = utils.database_connection(query)
-    for csn in csn_files:
-        csn = csn[0]
-        csn_loaded = json.loads(csn)
-        print(csn_loaded)
-        objectName = list(csn_loaded['definitions'].keys())[0]
-        elements = csn_loaded["definitions"][objectName]["elements"]
+    if not csn_files:
+        return pd.DataFrame(columns=['Field', 'Description'])
 
-        result =  [
-                    (key, val["@EndUserText.label"])
-                    for key, val in elements.items()
-                    if "@EndUserText.label" in val
-                ]
+    # The MAX(ARTIFACT_VERSION) join yields a single row
+    csn = csn_files[0][0]
+    csn_loaded = json.loads(csn)
+    objectName = next(iter(csn_loaded['definitions']))
+    elements = csn_loaded["definitions"][objectName]["elements"]
+
+    result =  [
+                (key, val["@EndUserText.label"])
+                for key, val in elements.items()
+                if "@EndUserText.label" in val
+            ]
         
     return  pd.DataFrame(result, columns=['Field', 'Description'])
\ No newline at end of file
@@ -10,6 +10,7 @@ Features:
 
 import streamlit as st
 import logging
+import pandas as pd
 from datetime import datetime
 from typing import List, Optional, Dict, Tuple
 
@@ -493,5 +494,74 @@ def get_all_objects_cached() -> List[Dict]:
     return utils.get_all_objects()
 
 
+# Session key for the columnar copy of the cached objects: (cache timestamp, DataFrame)
+OBJECTS_FRAME_KEY = 'cache_all_objects_frame'
+
+
+def get_all_objects_frame() -> Optional[pd.DataFrame]:
+    """
+    Get the cached objects as a DataFrame for vectorized filtering.
+
+    Built once per cache load (keyed on the cache timestamp).
+
+    Returns:
+        DataFrame with technicalName, object_type, space_id and object_name
+        columns, or None if the cache is not loaded or empty
+    """
+    if not (CACHE_AVAILABLE and CacheManager.is_cache_loaded()):
+        return None
+
+    metadata = CacheManager.get_cache_metadata()
+    stored = st.session_state.get(OBJECTS_FRAME_KEY)
+    if stored and stored[0] == metadata.timestamp:
+        return stored[1]
+
+    objects = CacheManager.get_cached_objects()
+    if not objects:
+        return None
+
+    frame = pd.DataFrame({
+        'technicalName': [obj.technical_name for obj in objects],
+        'object_type': [obj.object_type for obj in objects],
+        'space_id': [obj.space_id for obj in objects],
+        'object_name': [obj.object_name for obj in objects],
+    })
+    st.session_state[OBJECTS_FRAME_KEY] = (metadata.timestamp, frame)
+    return frame
+
+
+def get_object_options(
+    session_key: str,
+    metadata: CacheMetadata,
+    cached_objects: List[DataspherObject]
+) -> Tuple[tuple, Dict[str, DataspherObject]]:
+    """
+    Dropdown labels and label -> object mapping for the cached objects.
+
+    Labels keep the cache's object order. Built once per cache load (keyed
+    on the cache timestamp) and kept in session state under session_key,
+    so reruns don't re-format every label.
+
+    Args:
+        session_key: Session state key of the calling page
+        metadata: Current cache metadata
+        cached_objects: Objects from the cache
+
+    Returns:
+        Tuple of (labels tuple, dict mapping label to object)
+    """
+    stored = st.session_state.get(session_key)
+    if stored and stored[0] == metadata.timestamp:
+        return stored[1], stored[2]
+
+    object_options = {
+        f"{obj.technical_name} ({obj.space_id})": obj
+        for obj in cached_objects
+    }
+    labels = tuple(object_options)
+    st.session_state[session_key] = (metadata.timestamp, labels, object_options)
+    return labels, object_options
+
+
 # V1 Compatibility - add alias for old function name
 get_space_names_cached = get_space_business_names_cached
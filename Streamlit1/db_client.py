@@ -11,6 +11,7 @@ from contextlib import contextmanager
 from hdbcli import dbapi
 
 from .models import AppConfig, DatabaseError, CSNDefinition
+from . import utils
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -291,9 +292,8 @@ class HANAClient:
 
             # Parse CSN JSON
             csn_json = results[0][0]
-            if isinstance(csn_json, str):
-                import json
-                csn_data = json.loads(csn_json)
+            if isinstance(csn_json, (str, bytes)):
+                csn_data = utils.json_loads(csn_json)
             else:
                 csn_data = csn_json
 
@@ -5,19 +5,23 @@ Generates comprehensive documentation from lineage and CSN definitions,
 including field-level mappings and transformation logic.
 """
 
+from __future__ import annotations
+
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from datetime import datetime
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.style import WD_STYLE_TYPE
 
 from .models import LineageTree, LineageNode, CSNDefinition, CSNElement, AppConfig
 from .api_client import DataspherAPIClient
 from .db_client import HANAClient
 from .lineage import LineageAnalyzer
 
+if TYPE_CHECKING:
+    from docx.document import Document
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +30,8 @@ class DocumentationBuilder:
     Builds comprehensive documentation from lineage and object definitions.
     """
 
+    FIELD_TABLE_CACHE_SIZE = 512
+
     def __init__(self, config: AppConfig):
         """
         Initialize documentation builder.
@@ -36,6 +42,11 @@ class DocumentationBuilder:
         self.config = config
         self.api_client = DataspherAPIClient(config)
         self.db_client = HANAClient(config)
+        # Rendered field tables (<w:tbl> elements) keyed by (space, object, object hash)
+        # The builder is shared across sessions and download threads, so
+        # every access to the LRU goes through the lock
+        self._field_table_cache: OrderedDict = OrderedDict()
+        self._field_table_lock = threading.Lock()
 
     def build_lineage_documentation(
         self,
@@ -66,7 +77,9 @@ class DocumentationBuilder:
             if filtered_tree:
                 lineage_tree = filtered_tree
 
-        # Create document
+        # Create document (python-docx is imported lazily to keep page load fast)
+        from docx import Document
+
         doc = Document()
 
         # Add title and metadata
@@ -98,6 +111,8 @@ class DocumentationBuilder:
 
     def _add_title_page(self, doc: Document, object_name: str, lineage_tree: LineageTree):
         """Add title page to document."""
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
         # Title
         title = doc.add_heading(f"Data Lineage Documentation", 0)
         title.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -194,122 +209,170 @@ class DocumentationBuilder:
         """Add detailed section for each object."""
         doc.add_heading("2. Object Details", 1)
 
-        all_objects = lineage_tree.get_all_objects()
+        # Shared objects are documented once, not once per reference in the tree
+        all_objects = lineage_tree.unique_objects
+
+        if not all_objects:
+            doc.add_paragraph("No objects found in lineage.")
+            return
+
+        if not include_fields:
+            for idx, obj in enumerate(all_objects, 1):
+                doc.add_heading(f"2.{idx} {obj.name}", 2)
+                self._add_object_info_table(doc, obj)
+                doc.add_paragraph()  # Spacing
+            return
 
-        for idx, obj in enumerate(all_objects, 1):
+        # Resolve spaces once up front instead of per iteration
+        space_ids = [
+            self._extract_space_id(obj.qualified_name, obj.folder_id)
+            for obj in all_objects
+        ]
+
+        for idx, (obj, space_id) in enumerate(zip(all_objects, space_ids), 1):
             doc.add_heading(f"2.{idx} {obj.name}", 2)
+            self._add_object_info_table(doc, obj)
 
-            # Basic info
-            info_table = doc.add_table(rows=4, cols=2)
-            info_table.style = 'Light Grid Accent 1'
-
-            info_table.rows[0].cells[0].text = "Qualified Name"
-            info_table.rows[0].cells[1].text = obj.qualified_name
-
-            info_table.rows[1].cells[0].text = "Object Type"
-            info_table.rows[1].cells[1].text = obj.kind
-
-            info_table.rows[2].cells[0].text = "Transactional"
-            info_table.rows[2].cells[1].text = "Yes" if obj.is_transactional() else "No"
-
-            info_table.rows[3].cells[0].text = "Dependencies"
-            info_table.rows[3].cells[1].text = str(len(obj.dependencies))
-
-            # Get field information if available
-            if include_fields:
-                field_data = None
-                space_id = None
-
-                try:
-                    # Extract space from qualified name or folder
-                    space_id = self._extract_space_id(obj.qualified_name, obj.folder_id)
-
-                    logger.info(f"Attempting to get field info for {obj.qualified_name}, space_id: {space_id}")
-
-                    if space_id:
-                        # Try CSN first (more detailed metadata)
-                        try:
-                            logger.info(f"Querying CSN for {obj.qualified_name} in space {space_id}")
-                            csn_def = self.db_client.get_object_csn(space_id, obj.qualified_name)
-                            if csn_def and csn_def.elements:
-                                field_data = ('csn', csn_def.elements)
-                                logger.info(f"Successfully retrieved {len(csn_def.elements)} fields from CSN")
-                        except Exception as csn_error:
-                            logger.warning(f"CSN query failed for {obj.qualified_name}: {csn_error}")
-                            # If CSN fails (e.g., $$DEPLOY_ARTIFACTS$$ not available), try M_CS_COLUMNS
-                            if "$$DEPLOY_ARTIFACTS$$" in str(csn_error) or "invalid table name" in str(csn_error).lower():
-                                logger.info(f"Trying M_CS_COLUMNS as fallback for {obj.qualified_name}")
-                                try:
-                                    columns = self.db_client.get_table_columns(space_id, obj.qualified_name)
-                                    if columns:
-                                        field_data = ('columns', columns)
-                                        logger.info(f"Successfully retrieved {len(columns)} columns from M_CS_COLUMNS")
-                                except Exception as col_error:
-                                    logger.warning(f"M_CS_COLUMNS also failed for {obj.qualified_name}: {col_error}")
-                            else:
-                                raise csn_error
-
-                        if field_data:
-                            data_type, data = field_data
-                            doc.add_heading(f"2.{idx}.1 Fields", 3)
-
-                            if data_type == 'csn':
-                                # CSN data with full metadata
-                                field_table = doc.add_table(rows=len(data) + 1, cols=6)
-                                field_table.style = 'Light Grid Accent 1'
-
-                                # Header
-                                header_cells = field_table.rows[0].cells
-                                header_cells[0].text = "Key"
-                                header_cells[1].text = "Required"
-                                header_cells[2].text = "Field Name"
-                                header_cells[3].text = "Label"
-                                header_cells[4].text = "Type"
-                                header_cells[5].text = "Length"
-
-                                # Data rows
-                                for field_idx, element in enumerate(data, 1):
-                                    cells = field_table.rows[field_idx].cells
-                                    cells[0].text = "✓" if element.key else ""
-                                    cells[1].text = "✓" if element.not_null else ""
-                                    cells[2].text = element.technical_name
-                                    cells[3].text = element.label or "-"
-                                    cells[4].text = element.type
-                                    cells[5].text = str(element.length) if element.length else "-"
-                            else:
-                                # Column data from M_CS_COLUMNS
-                                field_table = doc.add_table(rows=len(data) + 1, cols=5)
-                                field_table.style = 'Light Grid Accent 1'
-
-                                # Header
-                                header_cells = field_table.rows[0].cells
-                                header_cells[0].text = "Nullable"
-                                header_cells[1].text = "Field Name"
-                                header_cells[2].text = "Type"
-                                header_cells[3].text = "Length"
-                                header_cells[4].text = "Scale"
-
-                                # Data rows
-                                for field_idx, col in enumerate(data, 1):
-                                    cells = field_table.rows[field_idx].cells
-                                    cells[0].text = "Yes" if col.get('IS_NULLABLE') == 'TRUE' else "No"
-                                    cells[1].text = col.get('COLUMN_NAME', '-')
-                                    cells[2].text = col.get('DATA_TYPE_NAME', '-')
-                                    cells[3].text = str(col.get('LENGTH', '-'))
-                                    cells[4].text = str(col.get('SCALE', '-')) if col.get('SCALE') else "-"
-                        else:
-                            logger.debug(f"No field information found for {obj.qualified_name}")
-                    else:
-                        logger.debug(f"Could not extract space_id for {obj.qualified_name}, skipping field information")
-
-                except Exception as e:
-                    logger.warning(f"Failed to fetch field information for {obj.qualified_name}: {e}")
-                    # Only show error message if it's not a known table issue
-                    if "$$DEPLOY_ARTIFACTS$$" not in str(e) and "invalid table name" not in str(e).lower():
-                        doc.add_paragraph(f"Note: Field information not available ({str(e)[:100]})")
+            if space_id:
+                self._add_object_fields(doc, idx, obj, space_id)
+            else:
+                logger.debug(f"Could not extract space_id for {obj.qualified_name}, skipping field information")
 
             doc.add_paragraph()  # Spacing
 
+    def _add_object_info_table(self, doc: Document, obj: LineageNode):
+        """Add basic information table for a single object."""
+        info_table = doc.add_table(rows=4, cols=2)
+        info_table.style = 'Light Grid Accent 1'
+
+        info_table.rows[0].cells[0].text = "Qualified Name"
+        info_table.rows[0].cells[1].text = obj.qualified_name
+
+        info_table.rows[1].cells[0].text = "Object Type"
+        info_table.rows[1].cells[1].text = obj.kind
+
+        info_table.rows[2].cells[0].text = "Transactional"
+        info_table.rows[2].cells[1].text = "Yes" if obj.is_transactional() else "No"
+
+        info_table.rows[3].cells[0].text = "Dependencies"
+        info_table.rows[3].cells[1].text = str(len(obj.dependencies))
+
+    def _add_object_fields(self, doc: Document, idx: int, obj: LineageNode, space_id: str):
+        """Add field table for a single object (CSN first, M_CS_COLUMNS as fallback)."""
+        # Objects with a known hash render identically until they change; reuse
+        # the table built in an earlier generation instead of querying again
+        cache_key = (space_id, obj.qualified_name, obj.hash) if obj.hash else None
+        cached_tbl = None
+        if cache_key:
+            with self._field_table_lock:
+                cached_tbl = self._field_table_cache.get(cache_key)
+                if cached_tbl is not None:
+                    self._field_table_cache.move_to_end(cache_key)
+                    cached_tbl = deepcopy(cached_tbl)
+        if cached_tbl is not None:
+            doc.add_heading(f"2.{idx}.1 Fields", 3)
+            # Append like add_table does: last block, before the section properties
+            body = doc.element.body
+            if body.sectPr is not None:
+                body.sectPr.addprevious(cached_tbl)
+            else:
+                body.append(cached_tbl)
+            return
+
+        field_data = None
+
+        try:
+            logger.info(f"Attempting to get field info for {obj.qualified_name}, space_id: {space_id}")
+
+            # Try CSN first (more detailed metadata)
+            try:
+                logger.info(f"Querying CSN for {obj.qualified_name} in space {space_id}")
+                csn_def = self.db_client.get_object_csn(space_id, obj.qualified_name)
+                if csn_def and csn_def.elements:
+                    field_data = ('csn', csn_def.elements)
+                    logger.info(f"Successfully retrieved {len(csn_def.elements)} fields from CSN")
+            except Exception as csn_error:
+                logger.warning(f"CSN query failed for {obj.qualified_name}: {csn_error}")
+                # If CSN fails (e.g., $$DEPLOY_ARTIFACTS$$ not available), try M_CS_COLUMNS
+                if "$$DEPLOY_ARTIFACTS$$" in str(csn_error) or "invalid table name" in str(csn_error).lower():
+                    logger.info(f"Trying M_CS_COLUMNS as fallback for {obj.qualified_name}")
+                    try:
+                        columns = self.db_client.get_table_columns(space_id, obj.qualified_name)
+                        if columns:
+                            field_data = ('columns', columns)
+                            logger.info(f"Successfully retrieved {len(columns)} columns from M_CS_COLUMNS")
+                    except Exception as col_error:
+                        logger.warning(f"M_CS_COLUMNS also failed for {obj.qualified_name}: {col_error}")
+                else:
+                    raise csn_error
+
+            if not field_data:
+                logger.debug(f"No field information found for {obj.qualified_name}")
+                return
+
+            data_type, data = field_data
+            doc.add_heading(f"2.{idx}.1 Fields", 3)
+
+            if data_type == 'csn':
+                # CSN data with full metadata
+                field_table = doc.add_table(rows=len(data) + 1, cols=6)
+                field_table.style = 'Light Grid Accent 1'
+
+                # Header
+                header_cells = field_table.rows[0].cells
+                header_cells[0].text = "Key"
+                header_cells[1].text = "Required"
+                header_cells[2].text = "Field Name"
+                header_cells[3].text = "Label"
+                header_cells[4].text = "Type"
+                header_cells[5].text = "Length"
+
+                # Data rows - resolve all cells once; rows[i] rescans the table per call
+                table_cells = field_table._cells
+                for field_idx, element in enumerate(data, 1):
+                    cells = table_cells[field_idx * 6:(field_idx + 1) * 6]
+                    cells[0].text = "✓" if element.key else ""
+                    cells[1].text = "✓" if element.not_null else ""
+                    cells[2].text = element.technical_name
+                    cells[3].text = element.label or "-"
+                    cells[4].text = element.type
+                    cells[5].text = str(element.length) if element.length else "-"
+            else:
+                # Column data from M_CS_COLUMNS
+                field_table = doc.add_table(rows=len(data) + 1, cols=5)
+                field_table.style = 'Light Grid Accent 1'
+
+                # Header
+                header_cells = field_table.rows[0].cells
+                header_cells[0].text = "Nullable"
+                header_cells[1].text = "Field Name"
+                header_cells[2].text = "Type"
+                header_cells[3].text = "Length"
+                header_cells[4].text = "Scale"
+
+                # Data rows - resolve all cells once; rows[i] rescans the table per call
+                table_cells = field_table._cells
+                for field_idx, col in enumerate(data, 1):
+                    cells = table_cells[field_idx * 5:(field_idx + 1) * 5]
+                    cells[0].text = "Yes" if col.get('IS_NULLABLE') == 'TRUE' else "No"
+                    cells[1].text = col.get('COLUMN_NAME', '-')
+                    cells[2].text = col.get('DATA_TYPE_NAME', '-')
+                    cells[3].text = str(col.get('LENGTH', '-'))
+                    cells[4].text = str(col.get('SCALE', '-')) if col.get('SCALE') else "-"
+
+            if cache_key:
+                rendered_tbl = deepcopy(field_table._tbl)
+                with self._field_table_lock:
+                    self._field_table_cache[cache_key] = rendered_tbl
+                    if len(self._field_table_cache) > self.FIELD_TABLE_CACHE_SIZE:
+                        self._field_table_cache.popitem(last=False)
+
+        except Exception as e:
+            logger.warning(f"Failed to fetch field information for {obj.qualified_name}: {e}")
+            # Only show error message if it's not a known table issue
+            if "$$DEPLOY_ARTIFACTS$$" not in str(e) and "invalid table name" not in str(e).lower():
+                doc.add_paragraph(f"Note: Field information not available ({str(e)[:100]})")
+
     def _add_field_mapping_section(self, doc: Document, lineage_tree: LineageTree):
         """Add field mapping summary section."""
         doc.add_page_break()
@@ -322,7 +385,7 @@ class DocumentationBuilder:
 
         # Get transactional objects only (flows)
         transactional_objects = [
-            obj for obj in lineage_tree.get_all_objects()
+            obj for obj in lineage_tree.unique_objects
             if obj.is_transactional()
         ]
 
@@ -358,10 +421,13 @@ class DocumentationBuilder:
         doc.add_heading("A. Complete Object List", 2)
 
         # Flat list of all objects
-        all_objects = lineage_tree.get_all_objects()
+        all_objects = lineage_tree.unique_objects
 
-        obj_table = doc.add_table(rows=len(all_objects) + 1, cols=4)
+        # Header row plus one empty row used as the template for all data rows
+        obj_table = doc.add_table(rows=2, cols=4)
         obj_table.style = 'Light Grid Accent 1'
+        template_tr = obj_table.rows[1]._tr
+        obj_table._tbl.remove(template_tr)
 
         # Header
         obj_table.rows[0].cells[0].text = "#"
@@ -369,12 +435,12 @@ class DocumentationBuilder:
         obj_table.rows[0].cells[2].text = "Type"
         obj_table.rows[0].cells[3].text = "Transactional"
 
-        # Data
-        for idx, obj in enumerate(all_objects, 1):
-            obj_table.rows[idx].cells[0].text = str(idx)
-            obj_table.rows[idx].cells[1].text = obj.qualified_name
-            obj_table.rows[idx].cells[2].text = obj.kind
-            obj_table.rows[idx].cells[3].text = "Yes" if obj.is_transactional() else "No"
+        # Data - build all rows first and append them to the table in one go
+        rows = [
+            (str(idx), obj.qualified_name, obj.kind, "Yes" if obj.is_transactional() else "No")
+            for idx, obj in enumerate(all_objects, 1)
+        ]
+        obj_table._tbl.extend([_make_table_row(template_tr, row) for row in rows])
 
         # Glossary
         doc.add_heading("B. Glossary", 2)
@@ -423,6 +489,23 @@ class DocumentationBuilder:
         return None
 
 
+def _make_table_row(template_tr, values) -> Any:
+    """
+    Create a table row element from an empty template row.
+
+    Args:
+        template_tr: Empty <w:tr> element to copy cell formatting from
+        values: Cell texts, one per column
+
+    Returns:
+        New <w:tr> element
+    """
+    tr = deepcopy(template_tr)
+    for tc, value in zip(tr.tc_lst, values):
+        tc.p_lst[0].add_r().text = value
+    return tr
+
+
 def save_documentation(doc: Document, filename: str) -> bool:
     """
     Save documentation to file.
@@ -1,11 +1,44 @@
+import functools
+from types import MappingProxyType
+import numpy as np
 import pandas as pd
 import streamlit as st
 from . import utils
-import json
 import requests
 from .config_helpers import get_credentials_from_session
+from .models import DatabaseError
 
 
+# Columns of the field details table
+FIELD_COLUMNS = ['Field', 'Description', 'Key', 'Type', 'Length', 'Measure']
+
+# Object name prefix -> space mapping (naming convention)
+PREFIX_TO_SPACE = {
+    '01_ACQ': '01_ACQUISITION',
+    '02_DWH': '02_DATAWAREHOUSE',
+    '03_SAL': '03_SALES',
+    '03_FIN': '03_FINANCE',
+    '04_PBI': '04_POWERBI'
+}
+
+
+def _build_prefix_trie(prefix_to_space):
+    """
+    Build a two-level prefix tree from the NN_XXX prefix mapping
+
+    '03' -> {'SAL': (space, prefix), 'FIN': (space, prefix)}, so a lookup
+    costs two dict hits regardless of how many prefixes are configured.
+    """
+    trie = {}
+    for prefix, space in prefix_to_space.items():
+        trie.setdefault(prefix[:2], {})[prefix[3:]] = (space, prefix)
+    return trie
+
+
+_PREFIX_TRIE = _build_prefix_trie(PREFIX_TO_SPACE)
+
+
+@functools.lru_cache(maxsize=1024)
 def derive_space_from_object_name(object_name):
     """
     Derive the space ID from the object naming convention
@@ -23,22 +56,43 @@ def derive_space_from_object_name(object_name):
     Returns:
     - Tuple: (space_id, prefix) if pattern matches, (None, None) otherwise
     """
-    # Define prefix to space mapping
-    prefix_to_space = {
-        '01_ACQ': '01_ACQUISITION',
-        '02_DWH': '02_DATAWAREHOUSE',
-        '03_SAL': '03_SALES',
-        '03_FIN': '03_FINANCE',
-        '04_PBI': '04_POWERBI'
-    }
+    if object_name[2:3] != '_':
+        return None, None
     
-    # Check each prefix
-    for prefix, space in prefix_to_space.items():
-        if object_name.startswith(prefix):
-            return space, prefix
+    family = _PREFIX_TRIE.get(object_name[:2])
+    if family is None:
+        return None, None
     
-    # No matching prefix found
-    return None, None
+    return family.get(object_name[3:6], (None, None))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_design_object_index(dsp_host, client_id, space_id, _header):
+    """
+    Fetch all design objects of a space and index them by technical name
+
+    Cached for 60 seconds per (dsp_host, client_id, space_id) so repeated
+    searches in the same space skip the network round trip.
+
+    Parameters:
+    - dsp_host: Datasphere host URL (cache key)
+    - client_id: OAuth client the header belongs to (cache key)
+    - space_id: The space ID to list objects from (cache key)
+    - _header: OAuth request header (excluded from the cache key)
+
+    Returns:
+    - Dictionary mapping qualified_name and name to the raw object
+    """
+    url = utils.get_url(dsp_host, 'all_design_objects').format(**{"spaceID": space_id})
+    response = utils.http_session.get(url, headers=_header, timeout=utils.HTTP_TIMEOUT)
+    response.raise_for_status()
+
+    index = {}
+    for obj in response.json().get('results', []):
+        # First occurrence wins, matching the previous linear search order
+        index.setdefault(obj.get('qualified_name', obj.get('name', '')), obj)
+        index.setdefault(obj.get('name'), obj)
+    return index
 
 
 def search_object(object_name, space_id):
@@ -54,33 +108,28 @@ def search_object(object_name, space_id):
     """
     # Get credentials from V2 app_config or V1 session state
     creds = get_credentials_from_session()
-    header = utils.initializeGetOAuthSession(creds['token'], creds['secret'])
-
-    # Try to get all design objects and find the matching one
-    url = utils.get_url(creds['dsp_host'], 'all_design_objects').format(**{"spaceID": space_id})
+    header = utils.get_oauth_header(creds['token'], creds['secret'])
     
     try:
-        response = requests.get(url, headers=header)
-        if response.status_code == 200:
-            data = response.json()
-            objects = data.get('results', [])
-            
-            # Search for the object by technical name
-            for obj in objects:
-                qualified_name = obj.get('qualified_name', obj.get('name', ''))
-                if qualified_name == object_name or obj.get('name') == object_name:
-                    return {
-                        'id': obj.get('id'),
-                        'technicalName': qualified_name,
-                        'businessName': obj.get('business_name', ''),
-                        'type': obj.get('kind', 'Unknown'),
-                        'space_id': space_id
-                    }
+        index = _get_design_object_index(creds['dsp_host'], creds['client_id'], space_id, header)
+    except requests.HTTPError:
         return None
     except Exception as e:
         st.error(f"Error searching for object: {e}")
         return None
 
+    obj = index.get(object_name)
+    if obj is None:
+        return None
+
+    return {
+        'id': obj.get('id'),
+        'technicalName': obj.get('qualified_name', obj.get('name', '')),
+        'businessName': obj.get('business_name', ''),
+        'type': obj.get('kind', 'Unknown'),
+        'space_id': space_id
+    }
+
 
 def search_object_smart(object_name, space_filter=None):
     """
@@ -110,89 +159,185 @@ def search_object_smart(object_name, space_filter=None):
         return None, None, True
 
 
-def get_business_and_technical_names(artifact, space_id):
+def _get_connection_scope():
+    """Return (dsp_host, client_id, hdb_address, hdb_user) of the current session, used in cache keys"""
+    creds = get_credentials_from_session()
+    if 'app_config' in st.session_state:
+        config = st.session_state['app_config']
+        return creds['dsp_host'], creds['client_id'], config.hdb_address, config.hdb_user
+    return creds['dsp_host'], creds['client_id'], st.session_state.get('hdb_address'), st.session_state.get('hdb_user')
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_csn(hdb_address, hdb_user, artifact, space_id):
     """
-    Get business and technical field names from CSN definition with extended metadata
-    
+    Load and parse the latest CSN definition of an artifact
+
+    Used by get_object_metadata_and_fields, so a page render issues one
+    query and one JSON parse per object.
+    Cached for 5 minutes per (hdb_address, hdb_user, artifact, space_id); only the
+    first (main) definition is kept, auxiliary definitions are dropped
+    after parsing.
+
     Parameters:
+    - hdb_address: HANA address of the session's connection (cache key)
+    - hdb_user: HANA user of the session's connection (cache key)
     - artifact: Technical name of the artifact
     - space_id: The space ID
-    
+
     Returns:
-    - DataFrame with Field, Description, Key, Type, Length, and Measure columns
+    - Tuple: (object name, CSN definition of the object, artifact version)
+
+    Raises:
+    - DatabaseError: If no CSN row was returned (not cached, so a failed
+      connection is retried on the next call)
     """
+    # Schema identifier must stay literal; filter values are bound so HANA
+    # can reuse the prepared statement across artifacts of the same space
     query = f'''
-        SELECT A.CSN
+        SELECT TOP 1 A.CSN, A.ARTIFACT_VERSION
         FROM "{space_id}$TEC"."$$DEPLOY_ARTIFACTS$$" A
         INNER JOIN (
           SELECT ARTIFACT_NAME, MAX(ARTIFACT_VERSION) AS MAX_ARTIFACT_VERSION
           FROM "{space_id}$TEC"."$$DEPLOY_ARTIFACTS$$"
-          WHERE SCHEMA_NAME = '{space_id}' AND ARTIFACT_NAME = '{artifact}'
+          WHERE SCHEMA_NAME = ? AND ARTIFACT_NAME = ?
           GROUP BY ARTIFACT_NAME
         ) B
         ON A.ARTIFACT_NAME = B.ARTIFACT_NAME
         AND A.ARTIFACT_VERSION = B.MAX_ARTIFACT_VERSION;
     '''
     
-    try:
-        csn_files = utils.database_connection(query)
+    csn_files = utils.database_connection(query, (space_id, artifact))
+    if not csn_files:
+        raise DatabaseError(f"No CSN found for {artifact} in {space_id}", query=query)
+    
+    csn_string, version = csn_files[0][0], csn_files[0][1]
+    definitions = utils.json_loads(csn_string)['definitions']
+    objectName = next(iter(definitions))
+    return objectName, definitions[objectName], version
+
+
+def _elements_to_field_frame(elements):
+    """
+    Build the field details DataFrame from CSN elements with column-wise operations
+    
+    Parameters:
+    - elements: CSN "elements" dict (field name -> element definition)
+    
+    Returns:
+    - DataFrame with Field, Description, Key, Type, Length, and Measure columns
+    """
+    if not elements:
+        return pd.DataFrame(columns=FIELD_COLUMNS)
+    
+    # One row per field, one column per CSN attribute (object dtype keeps ints as ints)
+    raw = pd.DataFrame(list(elements.values()), index=list(elements), dtype=object)
+    missing = pd.Series(None, index=raw.index, dtype=object)
+    
+    def column(name):
+        return raw[name] if name in raw.columns else missing
+    
+    def present(name):
+        # Key presence, as opposed to a non-null value ({'x': None} counts)
+        return np.fromiter((name in val for val in elements.values()), dtype=bool, count=len(elements))
+    
+    def truthy(name):
+        values = column(name)
+        return values.notna() & values.astype(bool)
+    
+    # Measure if any aggregation/analytics/semantic indicator is set
+    is_measure = (
+        truthy('@Aggregation.default')
+        | truthy('@Analytics.measure')
+        | present('@DefaultAggregation')
+        | truthy('@Semantics.quantity')
+        | truthy('@Semantics.amount')
+    )
+    
+    frame = pd.DataFrame({
+        'Field': raw.index.to_numpy(),
+        'Description': np.where(present('@EndUserText.label'), column('@EndUserText.label'), 'No description'),
+        'Key': np.where(truthy('key'), 'X', ''),
+        # Simplify type display (remove "cds." prefix if present)
+        'Type': column('type').fillna('').astype(str).str.removeprefix('cds.').to_numpy(),
+        # Set lengths as text; a falsy length (e.g. 0) is kept as-is, a missing one is ''
+        'Length': np.where(
+            truthy('length'),
+            column('length').astype(str),
+            np.where(present('length'), column('length'), '')
+        ),
+        'Measure': np.where(is_measure, 'X', ''),
+    })
+    
+    return frame
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_object_lineage_cached(dsp_host, client_id, object_id, space_id, _header):
+    """
+    Fetch the predecessors and successors of an object
+
+    Cached for 5 minutes per (dsp_host, client_id, object_id, space_id). Failures
+    raise instead of returning a fallback, so they are not cached.
+
+    Parameters:
+    - dsp_host: Datasphere host URL (cache key)
+    - client_id: OAuth client the header belongs to (cache key)
+    - object_id: The ID of the object
+    - space_id: The space ID
+    - _header: OAuth request header (excluded from the cache key)
+
+    Returns:
+    - Dictionary with 'predecessors' and 'successors' lists
+
+    Raises:
+    - LookupError: If the dependency endpoint did not answer with 200
+    """
+    url = utils.get_url(dsp_host, "dependency").format(**{"ID": object_id})
+    response = utils.http_session.get(url, headers=_header, timeout=utils.HTTP_TIMEOUT)
+    if response.status_code != 200:
+        raise LookupError(f"Lineage request for {object_id} returned {response.status_code}")
+
+    data = response.json()
+    
+    if not data:
+        return {'predecessors': [], 'successors': []}
+    
+    # Get the first object (should be our target object)
+    if isinstance(data, list) and len(data) > 0:
+        obj_data = data[0]
         
-        if not csn_files:
-            return pd.DataFrame(columns=['Field', 'Description', 'Key', 'Type', 'Length', 'Measure'])
+        predecessors = []
+        successors = []
         
-        for csn in csn_files:
-            csn = csn[0]
-            csn_loaded = json.loads(csn)
-            objectName = list(csn_loaded['definitions'].keys())[0]
-            
-            # Get elements (fields)
-            elements = csn_loaded["definitions"][objectName].get("elements", {})
-            
-            result = []
-            for key, val in elements.items():
-                # Get basic info
-                description = val.get("@EndUserText.label", "No description")
-                
-                # Check if it's a key field
-                is_key = "X" if val.get("key", False) else ""
-                
-                # Get data type
-                data_type = val.get("type", "")
-                # Simplify type display (remove "cds." prefix if present)
-                if data_type.startswith("cds."):
-                    data_type = data_type[4:]
-                
-                # Get length if available
-                length = val.get("length", "")
-                if length:
-                    length = str(length)
-                
-                # Check if it's a measure (aggregation property)
-                is_measure = ""
-                # Check for various measure indicators
-                if val.get("@Aggregation.default"):
-                    is_measure = "X"
-                elif val.get("@Analytics.measure"):
-                    is_measure = "X"
-                elif "@DefaultAggregation" in val:
-                    is_measure = "X"
-                # Check semantic usage for measures
-                elif val.get("@Semantics.quantity") or val.get("@Semantics.amount"):
-                    is_measure = "X"
-                
-                result.append((
-                    key,
-                    description,
-                    is_key,
-                    data_type,
-                    length,
-                    is_measure
-                ))
-            
-            return pd.DataFrame(result, columns=['Field', 'Description', 'Key', 'Type', 'Length', 'Measure'])
-    except Exception as e:
-        # Return empty dataframe on error
-        return pd.DataFrame(columns=['Field', 'Description', 'Key', 'Type', 'Length', 'Measure'])
+        # Get dependencies (objects that this object depends on - predecessors)
+        dependencies = obj_data.get('dependencies', [])
+        for dep in dependencies:
+            predecessors.append({
+                'id': dep.get('id'),
+                'technicalName': dep.get('qualifiedName', dep.get('name', 'Unknown')),
+                'businessName': dep.get('businessName', ''),
+                'type': dep.get('kind', 'Unknown'),
+                'space': dep.get('spaceName', space_id)
+            })
+        
+        # Get impacts (objects that depend on this object - successors)
+        impacts = obj_data.get('impacts', [])
+        for imp in impacts:
+            successors.append({
+                'id': imp.get('id'),
+                'technicalName': imp.get('qualifiedName', imp.get('name', 'Unknown')),
+                'businessName': imp.get('businessName', ''),
+                'type': imp.get('kind', 'Unknown'),
+                'space': imp.get('spaceName', space_id)
+            })
+        
+        return {
+            'predecessors': predecessors,
+            'successors': successors
+        }
+    
+    return {'predecessors': [], 'successors': []}
 
 
 def get_object_lineage(object_id, space_id):
@@ -208,135 +353,134 @@ def get_object_lineage(object_id, space_id):
     """
     # Get credentials from V2 app_config or V1 session state
     creds = get_credentials_from_session()
-    header = utils.initializeGetOAuthSession(creds['token'], creds['secret'])
-
-    url = utils.get_url(creds['dsp_host'], "dependency").format(**{"ID": object_id})
+    header = utils.get_oauth_header(creds['token'], creds['secret'])
     
     try:
-        response = requests.get(url, headers=header)
-        if response.status_code == 200:
-            data = response.json()
-            
-            if not data:
-                return {'predecessors': [], 'successors': []}
-            
-            # Get the first object (should be our target object)
-            if isinstance(data, list) and len(data) > 0:
-                obj_data = data[0]
-                
-                predecessors = []
-                successors = []
-                
-                # Get dependencies (objects that this object depends on - predecessors)
-                dependencies = obj_data.get('dependencies', [])
-                for dep in dependencies:
-                    predecessors.append({
-                        'id': dep.get('id'),
-                        'technicalName': dep.get('qualifiedName', dep.get('name', 'Unknown')),
-                        'businessName': dep.get('businessName', ''),
-                        'type': dep.get('kind', 'Unknown'),
-                        'space': dep.get('spaceName', space_id)
-                    })
-                
-                # Get impacts (objects that depend on this object - successors)
-                impacts = obj_data.get('impacts', [])
-                for imp in impacts:
-                    successors.append({
-                        'id': imp.get('id'),
-                        'technicalName': imp.get('qualifiedName', imp.get('name', 'Unknown')),
-                        'businessName': imp.get('businessName', ''),
-                        'type': imp.get('kind', 'Unknown'),
-                        'space': imp.get('spaceName', space_id)
-                    })
-                
-                return {
-                    'predecessors': predecessors,
-                    'successors': successors
-                }
-        
+        return _get_object_lineage_cached(creds['dsp_host'], creds['client_id'], object_id, space_id, header)
+    except LookupError:
         return {'predecessors': [], 'successors': []}
     except Exception as e:
         st.error(f"Error getting lineage: {e}")
         return {'predecessors': [], 'successors': []}
 
 
-def get_object_metadata(artifact, space_id):
+def _metadata_from_definition(objectName, obj_def, version):
     """
-    Get metadata about the object from CSN
+    Build the metadata dictionary from a parsed CSN definition
     
     Parameters:
-    - artifact: Technical name of the artifact
-    - space_id: The space ID
+    - objectName: Object name (CSN definitions key)
+    - obj_def: CSN definition of the object
+    - version: Artifact version
     
     Returns:
     - Dictionary with metadata information
     """
-    query = f'''
-        SELECT A.CSN, A.ARTIFACT_VERSION
-        FROM "{space_id}$TEC"."$$DEPLOY_ARTIFACTS$$" A
-        INNER JOIN (
-          SELECT ARTIFACT_NAME, MAX(ARTIFACT_VERSION) AS MAX_ARTIFACT_VERSION
-          FROM "{space_id}$TEC"."$$DEPLOY_ARTIFACTS$$"
-          WHERE SCHEMA_NAME = '{space_id}' AND ARTIFACT_NAME = '{artifact}'
-          GROUP BY ARTIFACT_NAME
-        ) B
-        ON A.ARTIFACT_NAME = B.ARTIFACT_NAME
-        AND A.ARTIFACT_VERSION = B.MAX_ARTIFACT_VERSION;
-    '''
+    metadata = {
+        'objectName': objectName,
+        'businessName': obj_def.get('@EndUserText.label', 'No description'),
+        'version': version,
+        'exposed': obj_def.get('@DataWarehouse.consumption.external', False),
+        'type': obj_def.get('kind', 'Unknown'),
+        'database_accessible': True
+    }
+    
+    # Check for Data Access Controls
+    dac_usage = obj_def.get('@DataWarehouse.dataAccessControl.usage', [])
+    if dac_usage:
+        metadata['hasDAC'] = True
+        metadata['dacObjects'] = [dac.get('target', 'Unknown') for dac in dac_usage]
+    else:
+        metadata['hasDAC'] = False
+        metadata['dacObjects'] = []
+    
+    return metadata
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_object_metadata_and_fields_cached(hdb_address, hdb_user, artifact, space_id):
+    """
+    Build object metadata and field details from the cached CSN load
+
+    Cached per (hdb_address, hdb_user, artifact, space_id); errors propagate
+    so they are not cached.
+    """
+    objectName, obj_def, version = _load_csn(hdb_address, hdb_user, artifact, space_id)
+    
+    metadata = _metadata_from_definition(objectName, obj_def, version)
+    field_info = _elements_to_field_frame(obj_def.get("elements", {}))
+    return metadata, field_info
+
+
+def get_object_metadata_and_fields(artifact, space_id):
+    """
+    Get object metadata and field details from a single CSN load
+    
+    Parameters:
+    - artifact: Technical name of the artifact
+    - space_id: The space ID
     
+    Returns:
+    - Tuple: (metadata dict, field DataFrame). On database errors the
+      metadata has database_accessible=False and the DataFrame is empty.
+    """
+    _, _, hdb_address, hdb_user = _get_connection_scope()
     try:
-        csn_files = utils.database_connection(query)
-        
-        if not csn_files:
-            return {'database_accessible': False}
-        
-        for csn_row in csn_files:
-            csn_string = csn_row[0]
-            version = csn_row[1]
-            
-            csn_loaded = json.loads(csn_string)
-            objectName = list(csn_loaded['definitions'].keys())[0]
-            obj_def = csn_loaded['definitions'][objectName]
-            
-            metadata = {
-                'objectName': objectName,
-                'businessName': obj_def.get('@EndUserText.label', 'No description'),
-                'version': version,
-                'exposed': obj_def.get('@DataWarehouse.consumption.external', False),
-                'type': obj_def.get('kind', 'Unknown'),
-                'database_accessible': True
-            }
-            
-            # Check for Data Access Controls
-            dac_usage = obj_def.get('@DataWarehouse.dataAccessControl.usage', [])
-            if dac_usage:
-                metadata['hasDAC'] = True
-                metadata['dacObjects'] = [dac.get('target', 'Unknown') for dac in dac_usage]
-            else:
-                metadata['hasDAC'] = False
-                metadata['dacObjects'] = []
-            
-            return metadata
+        return _get_object_metadata_and_fields_cached(hdb_address, hdb_user, artifact, space_id)
     except Exception as e:
         # Database not accessible - return minimal info
-        return {'database_accessible': False, 'error': str(e)}
+        return {'database_accessible': False, 'error': str(e)}, pd.DataFrame(columns=FIELD_COLUMNS)
 
 
-def format_object_type(object_type):
+def get_business_and_technical_names(artifact, space_id):
     """
-    Format object type for display
+    Get business and technical field names from CSN definition with extended metadata
+    
+    Thin wrapper over get_object_metadata_and_fields (same cached CSN load).
+    
+    Parameters:
+    - artifact: Technical name of the artifact
+    - space_id: The space ID
+    
+    Returns:
+    - DataFrame with Field, Description, Key, Type, Length, and Measure columns
     """
-    type_mapping = {
-        'sap.dwc.taskChain': 'Task Chain',
-        'sap.dis.transformationflow': 'Transformation Flow',
-        'sap.dis.dataflow': 'Data Flow',
-        'sap.dis.replicationflow': 'Replication Flow',
-        'entity': 'Entity/View',
-        'sap.dis.view': 'View',
-        'sap.dwc.view': 'View',
-        'sap.dis.localTable': 'Local Table',
-        'sap.dis.remoteTable': 'Remote Table',
-        'sap.dwc.analyticModel': 'Analytic Model'
-    }
+    return get_object_metadata_and_fields(artifact, space_id)[1]
+
+
+def get_object_metadata(artifact, space_id):
+    """
+    Get metadata about the object from CSN
     
-    return type_mapping.get(object_type, object_type)
\ No newline at end of file
+    Thin wrapper over get_object_metadata_and_fields (same cached CSN load).
+    
+    Parameters:
+    - artifact: Technical name of the artifact
+    - space_id: The space ID
+    
+    Returns:
+    - Dictionary with metadata information
+    """
+    return get_object_metadata_and_fields(artifact, space_id)[0]
+
+
+# Object kind -> display label (read-only)
+OBJECT_TYPE_LABELS = MappingProxyType({
+    'sap.dwc.taskChain': 'Task Chain',
+    'sap.dis.transformationflow': 'Transformation Flow',
+    'sap.dis.dataflow': 'Data Flow',
+    'sap.dis.replicationflow': 'Replication Flow',
+    'entity': 'Entity/View',
+    'sap.dis.view': 'View',
+    'sap.dwc.view': 'View',
+    'sap.dis.localTable': 'Local Table',
+    'sap.dis.remoteTable': 'Remote Table',
+    'sap.dwc.analyticModel': 'Analytic Model'
+})
+
+
+def format_object_type(object_type, _get=OBJECT_TYPE_LABELS.get):
+    """
+    Format object type for display
+    """
+    return _get(object_type, object_type)
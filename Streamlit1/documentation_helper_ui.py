@@ -1,8 +1,34 @@
 import streamlit as st
+from io import BytesIO
 from Streamlit1 import documentation_helper as doc_helper
+from Streamlit1 import executor as shared_executor
 import pandas as pd
 
 
+def _build_excel_bytes(df):
+    """Serialize the (filtered) field table to an Excel workbook"""
+    excel_buffer = BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Fields')
+    return excel_buffer.getvalue()
+
+
+def _field_search_text(df):
+    """Lowercased Field/Description/Type text per row for the field filter"""
+    # The unit separator keeps a match from spanning two columns
+    return (
+        df['Field'].astype(str) + '\x1f'
+        + df['Description'].astype(str) + '\x1f'
+        + df['Type'].astype(str)
+    ).str.lower()
+
+
+def _refresh_history_options():
+    """Recompute the last-10 history dropdown entries; call whenever doc_history changes"""
+    st.session_state.doc_history_last10 = [obj for obj, space in st.session_state.doc_history[-10:]]
+    st.session_state.doc_history_last10_set = set(st.session_state.doc_history_last10)
+
+
 def show_documentation_helper():
     """
     Main function to display the Documentation Helper UI
@@ -17,6 +43,8 @@ def show_documentation_helper():
         st.session_state.doc_current_space = st.session_state.get('dsp_space', '')
     if 'doc_history' not in st.session_state:
         st.session_state.doc_history = []
+    if 'doc_history_last10' not in st.session_state:
+        _refresh_history_options()
     if 'doc_selected_object_info' not in st.session_state:
         st.session_state.doc_selected_object_info = None
     if 'doc_search_term' not in st.session_state:
@@ -30,15 +58,15 @@ def show_documentation_helper():
         col1, col2, col3 = st.columns([3, 2, 1])
         
         with col1:
-            # Get history for dropdown options
-            history_options = [obj for obj, space in st.session_state.doc_history[-10:]]  # Last 10 items
+            # Get history for dropdown options (last 10 items, maintained on history changes)
+            history_options = st.session_state.doc_history_last10
             
             # Use selectbox if there's history, otherwise text_input
             if history_options:
                 search_term = st.selectbox(
                     "Technical Name",
                     options=[""] + history_options,
-                    index=0 if st.session_state.doc_search_term not in history_options else history_options.index(st.session_state.doc_search_term) + 1,
+                    index=0 if st.session_state.doc_search_term not in st.session_state.doc_history_last10_set else history_options.index(st.session_state.doc_search_term) + 1,
                     key="doc_search_input_form",
                     help="Select from recent searches or type a new object name"
                 )
@@ -130,6 +158,7 @@ def show_documentation_helper():
             # Add to navigation history
             if not st.session_state.doc_history or st.session_state.doc_history[-1] != (st.session_state.doc_current_object, st.session_state.doc_current_space):
                 st.session_state.doc_history.append((st.session_state.doc_current_object, st.session_state.doc_current_space))
+                _refresh_history_options()
             
             st.success(f"✅ Found in space: **{derived_space}**")
             st.rerun()
@@ -156,18 +185,21 @@ def show_documentation_helper():
     
     st.markdown("---")
     
-    # Get object information
+    # Get object information - metadata/fields (DB) and lineage (API) are
+    # independent, so run them concurrently
     with st.spinner(f"Loading information for {object_name}..."):
-        metadata = doc_helper.get_object_metadata(object_name, space_id)
-        
-        if not metadata.get('database_accessible', True):
-            st.warning(f"⚠️ Database access not available for space '{space_id}'. Showing limited information from API only.")
-            st.info("💡 **Tip**: You may not have database permissions for this space. Contact your administrator.")
-            field_info = pd.DataFrame(columns=['Key', 'Field', 'Description', 'Type', 'Length', 'Measure'])
-        else:
-            field_info = doc_helper.get_business_and_technical_names(object_name, space_id)
-        
-        lineage = doc_helper.get_object_lineage(obj_info['id'], space_id)
+        with shared_executor.script_ctx_pool(2) as pool:
+            csn_future = pool.submit(doc_helper.get_object_metadata_and_fields, object_name, space_id)
+            lineage_future = pool.submit(doc_helper.get_object_lineage, obj_info['id'], space_id)
+            
+            metadata, field_info = csn_future.result()
+            
+            if not metadata.get('database_accessible', True):
+                st.warning(f"⚠️ Database access not available for space '{space_id}'. Showing limited information from API only.")
+                st.info("💡 **Tip**: You may not have database permissions for this space. Contact your administrator.")
+                field_info = pd.DataFrame(columns=['Key', 'Field', 'Description', 'Type', 'Length', 'Measure'])
+            
+            lineage = lineage_future.result()
     
     # Field Details section with object info
     st.subheader(f"📊 Field Details - {object_name}")
@@ -192,10 +224,9 @@ def show_documentation_helper():
             field_search = st.text_input("🔍 Filter fields", "", key="field_search")
         
         if field_search:
+            # Plain substring match on one lowercased search string per field
             filtered_df = field_info[
-                field_info['Field'].str.contains(field_search, case=False, na=False) |
-                field_info['Description'].str.contains(field_search, case=False, na=False) |
-                field_info['Type'].str.contains(field_search, case=False, na=False)
+                _field_search_text(field_info).str.contains(field_search.lower(), regex=False, na=False)
             ]
         else:
             filtered_df = field_info
@@ -205,26 +236,19 @@ def show_documentation_helper():
         filtered_df = filtered_df[column_order]
         
         with col_export:
-            # CSV Download button - with correct column order
-            csv = filtered_df.to_csv(index=False)
+            # Both files are only serialized when their button is clicked
+            # (callable data), so reruns never rebuild them
             st.download_button(
                 label="📥 CSV",
-                data=csv,
+                data=lambda: filtered_df.to_csv(index=False),
                 file_name=f"{object_name}_fields.csv",
                 mime="text/csv",
                 use_container_width=True
             )
             
-            # Excel Download button - with correct column order
-            from io import BytesIO
-            excel_buffer = BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                filtered_df.to_excel(writer, index=False, sheet_name='Fields')
-            excel_buffer.seek(0)
-            
             st.download_button(
                 label="📊 Excel",
-                data=excel_buffer,
+                data=lambda: _build_excel_bytes(filtered_df),
                 file_name=f"{object_name}_fields.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
@@ -247,8 +271,8 @@ def show_documentation_helper():
         )
         
         # Field statistics
-        key_count = len(filtered_df[filtered_df['Key'] == 'X'])
-        measure_count = len(filtered_df[filtered_df['Measure'] == 'X'])
+        key_count = int((filtered_df['Key'] == 'X').sum())
+        measure_count = int((filtered_df['Measure'] == 'X').sum())
         
         stat_col1, stat_col2, stat_col3 = st.columns(3)
         with stat_col1:
@@ -273,4 +297,5 @@ def reset_documentation_helper():
     st.session_state.doc_current_object = None
     st.session_state.doc_current_space = st.session_state.get('dsp_space', '')
     st.session_state.doc_history = []
+    _refresh_history_options()
     st.session_state.doc_search_term = ""
\ No newline at end of file
@@ -4,17 +4,197 @@ Documentation Generator UI for SAP Datasphere Tools.
 Generates Word documentation from lineage with field mappings.
 """
 
+from __future__ import annotations
+
 import streamlit as st
+import hashlib
 import io
+import logging
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
 from .models import AppConfig, LineageTree
-from .lineage import LineageAnalyzer
-from .documentation_builder import DocumentationBuilder
-from .error_handler import handle_errors, display_success, display_info, ActivityLogger
-from .cache_manager import CacheManager
+from .error_handler import handle_errors, display_success, ActivityLogger
+from .cache_manager import CacheManager, get_object_options
 from .config_manager_v2 import ConfigManager
 
+logger = logging.getLogger(__name__)
+
+# Analyzer and builder pull in the API/HANA clients; they are imported on
+# first use so sidebar-only reruns don't pay for them
+if TYPE_CHECKING:
+    from .lineage import LineageAnalyzer
+    from .documentation_builder import DocumentationBuilder
+
+
+# Static page text, built once at import instead of in every rerun
+_DOC_CONTENTS_MD = """
+The generated Word document includes:
+
+### 1. Title Page
+- Document title and object name
+- Generation timestamp
+- Lineage statistics
+
+### 2. Overview
+- Purpose and scope
+- Lineage summary statistics
+- Object type distribution
+
+### 3. Object Details
+- Detailed information for each object
+- Field definitions (if enabled)
+- Data types, keys, and constraints
+
+### 4. Field Mappings
+- Source to target field mappings
+- Transformation logic overview
+
+### 5. Appendix
+- Complete object list
+- Glossary of terms
+
+### 📝 Next Steps
+1. Download the Word document
+2. Open in Microsoft Word
+3. Right-click the Table of Contents and select "Update Field"
+4. Review and customize as needed
+"""
+
+_INSTRUCTIONS_MD = """
+## How to Generate Documentation
+
+### Step 1: Select Lineage Source
+- **Use Existing Lineage**: If you just viewed lineage in the Lineage Analyzer page
+- **Fetch New Lineage**: Select an object from cache or enter object ID manually
+
+### Step 2: Configure Content
+- ✅ **Include Field Mappings**: Add detailed field information from CSN definitions
+- ✅ **Include Transformation Logic**: Document transformation flows
+- ⚪ **Transactional Only**: Focus only on data flows (exclude views/associations)
+
+### Step 3: Generate
+- Click "Generate Documentation" button
+- Wait for processing (may take 30-60 seconds for large lineages)
+- Download the Word document
+
+### 💡 Tips
+- **Field Mappings** require database access to fetch CSN definitions
+- **Large lineages** (100+ objects) may take longer to process
+- Documents can be customized in Word after generation
+- Use **Transactional Only** for cleaner flow documentation
+
+### 🎯 Use Cases
+- **Impact Analysis**: Document what would be affected by changing an object
+- **Onboarding**: Help new team members understand data flows
+- **Compliance**: Maintain audit trail of data lineage
+- **Migration Planning**: Document dependencies before system changes
+"""
+
+
+def _config_key(config: AppConfig) -> tuple:
+    """Short fingerprint of the tenant the cached lineage belongs to."""
+    return (config.dsp_host, config.client_id, config.hdb_address, config.hdb_user)
+
+
+def _client_key(config: AppConfig) -> tuple:
+    """
+    Fingerprint of the credentials a shared analyzer/builder is bound to.
+
+    The clients keep the config they were built with, so the OAuth token
+    and HANA password are part of the key: a refreshed token or another
+    user gets new clients instead of the first session's credentials.
+    Only a hash of the secrets is kept in the key.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Tenant fingerprint plus a digest of the current secrets
+    """
+    secrets = f"{config.access_token}\0{config.hdb_password}".encode()
+    return _config_key(config) + (hashlib.sha256(secrets).hexdigest(),)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _get_analyzer(client_key: tuple, _config: AppConfig) -> LineageAnalyzer:
+    """Shared LineageAnalyzer (and its pooled HTTP session) per set of credentials."""
+    from .lineage import LineageAnalyzer
+    return LineageAnalyzer(_config)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _get_builder(client_key: tuple, _config: AppConfig) -> DocumentationBuilder:
+    """Shared DocumentationBuilder (API and HANA clients) per set of credentials."""
+    from .documentation_builder import DocumentationBuilder
+    return DocumentationBuilder(_config)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_lineage_cached(config_key: tuple, object_id: str, object_name: str, _config: AppConfig) -> LineageTree:
+    """
+    Fetch the full lineage of an object, cached per tenant and object.
+
+    Args:
+        config_key: Fingerprint from _config_key; the config itself is not hashed
+        object_id: Object ID
+        object_name: Optional object name
+        _config: Application configuration used for the API calls
+
+    Returns:
+        LineageTree with upstream lineage and impact
+    """
+    analyzer = _get_analyzer(_client_key(_config), _config)
+    return analyzer.fetch_lineage(
+        object_id=object_id,
+        object_name=object_name,
+        recursive=True,
+        include_impact=True
+    )
+
+
+def _produce_docx(config: AppConfig, doc_request: dict, doc_state: dict) -> bytes:
+    """
+    Build the Word document for a prepared request.
+
+    Called by the download button only when the user clicks it, on a
+    server thread without the script context: Streamlit calls are ignored
+    there, so failures are recorded in doc_state and reported (once) by
+    the page on its next rerun; the next click simply retries the build. The built file is kept in doc_state, so repeated
+    clicks for the same request don't rebuild it.
+
+    Args:
+        config: Application configuration
+        doc_request: Keyword arguments for build_lineage_documentation
+        doc_state: Per-request state; receives 'docx' and 'size_kb', or 'error'
+
+    Returns:
+        The .docx file content
+
+    Raises:
+        Exception: Whatever the build raised, after recording it
+    """
+    cached: Optional[bytes] = doc_state.get('docx')
+    if cached is not None:
+        return cached
+
+    try:
+        builder = _get_builder(_client_key(config), config)
+        doc = builder.build_lineage_documentation(**doc_request)
+
+        doc_io = io.BytesIO()
+        doc.save(doc_io)
+    except Exception as e:
+        logger.exception("Documentation generation failed")
+        doc_state['error'] = str(e)
+        raise
+
+    docx = doc_io.getvalue()
+    doc_state['docx'] = docx
+    doc_state['size_kb'] = len(docx) / 1024
+    doc_state.pop('error', None)
+    return docx
+
 
 @handle_errors(show_traceback=True)
 def documentation_generator_page():
@@ -35,103 +215,110 @@ def documentation_generator_page():
         st.stop()
 
     # Sidebar controls
-    st.sidebar.header("⚙️ Documentation Options")
+    sb = st.sidebar
+    sb.header("⚙️ Documentation Options")
 
     # Check if we have lineage from lineage page
     has_existing_lineage = 'current_lineage' in st.session_state
 
     if has_existing_lineage:
         lineage_obj_name = st.session_state.get('lineage_object_name', 'Unknown')
-        st.sidebar.success(f"✅ Using lineage for: {lineage_obj_name}")
+        sb.success(f"✅ Using lineage for: {lineage_obj_name}")
 
-        use_existing = st.sidebar.radio(
+        use_existing = sb.radio(
             "Lineage Source",
             ["Use Existing Lineage", "Fetch New Lineage"]
         )
     else:
         use_existing = "Fetch New Lineage"
-        st.sidebar.info("ℹ️ No existing lineage found")
+        sb.info("ℹ️ No existing lineage found")
 
     # Object selection
     object_id = None
     object_name = None
+    labels = None
+    manual_entry = False
 
     if use_existing == "Fetch New Lineage":
-        st.sidebar.subheader("Object Selection")
+        sb.subheader("Object Selection")
 
-        selection_method = st.sidebar.radio(
+        selection_method = sb.radio(
             "Selection Method",
             ["Dropdown (from cache)", "Manual Entry"]
         )
 
         if selection_method == "Dropdown (from cache)":
             if not CacheManager.is_cache_loaded():
-                st.sidebar.warning("⚠️ Cache not loaded. Use Manual Entry or load cache.")
+                sb.warning("⚠️ Cache not loaded. Use Manual Entry or load cache.")
 
-                if st.sidebar.button("🔄 Load Cache"):
+                if sb.button("🔄 Load Cache"):
                     with st.spinner("Loading cache..."):
                         if CacheManager.load_cache(config):
                             display_success("Cache loaded!")
                             st.rerun()
             else:
                 metadata = CacheManager.get_cache_metadata()
-                st.sidebar.success(f"✅ Cache: {metadata.object_count} objects")
+                sb.success(f"✅ Cache: {metadata.object_count} objects")
 
                 cached_objects = CacheManager.get_cached_objects()
                 if cached_objects:
-                    object_options = {
-                        f"{obj.technical_name} ({obj.space_id})": obj
-                        for obj in cached_objects
-                    }
-
-                    selected_option = st.sidebar.selectbox(
-                        "Select Object",
-                        options=list(object_options.keys())
-                    )
-
-                    if selected_option:
-                        selected_obj = object_options[selected_option]
-                        object_id = selected_obj.object_id
-                        object_name = selected_obj.technical_name
+                    labels, object_options = get_object_options('doc_object_options', metadata, cached_objects)
 
         else:  # Manual Entry
-            object_id = st.sidebar.text_input(
+            manual_entry = True
+
+    # Object inputs and content options only apply on submit, so changing
+    # them doesn't rerun the page
+    with sb.form("doc_opts"):
+        if labels:
+            selected_option = st.selectbox(
+                "Select Object",
+                options=labels
+            )
+
+            if selected_option:
+                selected_obj = object_options[selected_option]
+                object_id = selected_obj.object_id
+                object_name = selected_obj.technical_name
+
+        elif manual_entry:
+            object_id = st.text_input(
                 "Object ID (hex)",
                 placeholder="6E4175B207AC02FB18004E421859F770"
             )
 
-            object_name = st.sidebar.text_input(
+            object_name = st.text_input(
                 "Object Name (optional)",
                 placeholder="02_DWH_CUBE_UNIVERSAL_LEDGER"
             )
 
-    # Documentation options
-    st.sidebar.subheader("Content Options")
+        # Documentation options
+        st.subheader("Content Options")
 
-    include_field_mappings = st.sidebar.checkbox(
-        "Include Field Mappings",
-        value=True,
-        help="Include detailed field-level information"
-    )
+        include_field_mappings = st.checkbox(
+            "Include Field Mappings",
+            value=True,
+            help="Include detailed field-level information"
+        )
 
-    include_transformations = st.sidebar.checkbox(
-        "Include Transformation Logic",
-        value=True,
-        help="Include transformation flow details"
-    )
+        include_transformations = st.checkbox(
+            "Include Transformation Logic",
+            value=True,
+            help="Include transformation flow details"
+        )
 
-    transactional_only = st.sidebar.checkbox(
-        "Transactional Objects Only",
-        value=False,
-        help="Document only data flows and transformations"
-    )
+        transactional_only = st.checkbox(
+            "Transactional Objects Only",
+            value=False,
+            help="Document only data flows and transformations"
+        )
 
-    # Generate button
-    generate_button = st.sidebar.button(
-        "📝 Generate Documentation",
-        type="primary",
-        use_container_width=True
-    )
+        # Generate button
+        generate_button = st.form_submit_button(
+            "📝 Generate Documentation",
+            type="primary",
+            use_container_width=True
+        )
 
     # Main content
     if generate_button:
@@ -150,12 +337,11 @@ def documentation_generator_page():
 
             with st.spinner(f"Fetching lineage for {object_name or object_id}..."):
                 try:
-                    analyzer = LineageAnalyzer(config)
-                    lineage_tree = analyzer.fetch_lineage(
-                        object_id=object_id,
-                        object_name=object_name,
-                        recursive=True,
-                        include_impact=True
+                    lineage_tree = _fetch_lineage_cached(
+                        _config_key(config),
+                        object_id,
+                        object_name,
+                        config
                     )
 
                     obj_name = object_name or object_id
@@ -164,136 +350,85 @@ def documentation_generator_page():
                     st.session_state['current_lineage'] = lineage_tree
                     st.session_state['lineage_object_name'] = obj_name
 
-                    display_success(f"Lineage fetched: {lineage_tree.count_objects()} objects")
+                    display_success(f"Lineage fetched: {lineage_tree.object_count} objects")
 
                 except Exception as e:
                     st.error(f"❌ Failed to fetch lineage: {str(e)}")
                     st.stop()
 
-        # Generate documentation
-        with st.spinner("📝 Generating documentation..."):
-            try:
-                builder = DocumentationBuilder(config)
-
-                doc = builder.build_lineage_documentation(
-                    lineage_tree=lineage_tree,
-                    root_object_name=obj_name,
-                    include_field_mappings=include_field_mappings,
-                    include_transformations=include_transformations,
-                    transactional_only=transactional_only
-                )
-
-                # Save to BytesIO
-                doc_io = io.BytesIO()
-                doc.save(doc_io)
-                doc_io.seek(0)
-
-                st.session_state['generated_doc'] = doc_io.getvalue()
-                st.session_state['doc_filename'] = f"lineage_doc_{obj_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-
-                display_success("✅ Documentation generated successfully!")
-                ActivityLogger.log(f"Documentation generated for {obj_name}", "success")
-
-            except Exception as e:
-                st.error(f"❌ Failed to generate documentation: {str(e)}")
-                ActivityLogger.log(f"Documentation generation failed: {str(e)}", "error")
-                st.stop()
+        # Same lineage and options as the prepared request - keep it (and its stats)
+        gen_key = (
+            lineage_tree.root.id,
+            lineage_tree.fetched_at,
+            obj_name,
+            include_field_mappings,
+            include_transformations,
+            transactional_only
+        )
 
-    # Display download button if doc is generated
-    if 'generated_doc' in st.session_state:
-        st.success("✅ Documentation ready for download!")
+        if st.session_state.get('doc_request_key') != gen_key:
+            # Defer the Word build to the download click - only keep what is needed to produce it
+            st.session_state['doc_request'] = {
+                'lineage_tree': lineage_tree,
+                'root_object_name': obj_name,
+                'include_field_mappings': include_field_mappings,
+                'include_transformations': include_transformations,
+                'transactional_only': transactional_only,
+            }
+            st.session_state['doc_request_key'] = gen_key
+            st.session_state['doc_state'] = {'size_kb': None}
+            st.session_state['doc_filename'] = f"lineage_doc_{obj_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+
+            display_success("✅ Documentation prepared - it will be built when you download it")
+            ActivityLogger.log(f"Documentation prepared for {obj_name}", "success")
+
+    # Display download button if a document request is prepared
+    if 'doc_request' in st.session_state:
+        doc_request = st.session_state['doc_request']
+        doc_state = st.session_state['doc_state']
+
+        # A failed download build is reported (and logged) once, here; the
+        # error is cleared so the next click retries the build
+        error = doc_state.pop('error', None)
+        if error:
+            ActivityLogger.log(f"Documentation generation failed: {error}", "error")
+            st.error(f"❌ Failed to generate documentation: {error}")
+            st.info("💡 Click **Download Word Document** again to retry.")
+        elif doc_state.get('docx') is not None:
+            st.success("✅ Documentation ready for download!")
+        else:
+            st.info("📄 Documentation will be built when you download it")
 
         col1, col2, col3 = st.columns([2, 1, 1])
 
         with col1:
             st.download_button(
                 label="📥 Download Word Document",
-                data=st.session_state['generated_doc'],
+                data=lambda: _produce_docx(config, doc_request, doc_state),
                 file_name=st.session_state['doc_filename'],
                 mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                 use_container_width=True
             )
 
         with col2:
-            if st.button("🔄 Generate New", use_container_width=True):
-                del st.session_state['generated_doc']
-                del st.session_state['doc_filename']
-                st.rerun()
+            st.metric("Objects", doc_request['lineage_tree'].object_count)
 
         with col3:
-            file_size = len(st.session_state['generated_doc']) / 1024
-            st.metric("File Size", f"{file_size:.1f} KB")
+            # Size is only known after the first download built the document
+            size_kb = doc_state['size_kb']
+            st.metric("File Size", f"{size_kb:.1f} KB" if size_kb is not None else "~")
 
         # Preview info
         st.markdown("---")
         st.subheader("📋 Document Contents")
 
-        st.markdown("""
-        The generated Word document includes:
-
-        ### 1. Title Page
-        - Document title and object name
-        - Generation timestamp
-        - Lineage statistics
-
-        ### 2. Overview
-        - Purpose and scope
-        - Lineage summary statistics
-        - Object type distribution
-
-        ### 3. Object Details
-        - Detailed information for each object
-        - Field definitions (if enabled)
-        - Data types, keys, and constraints
-
-        ### 4. Field Mappings
-        - Source to target field mappings
-        - Transformation logic overview
-
-        ### 5. Appendix
-        - Complete object list
-        - Glossary of terms
-
-        ### 📝 Next Steps
-        1. Download the Word document
-        2. Open in Microsoft Word
-        3. Right-click the Table of Contents and select "Update Field"
-        4. Review and customize as needed
-        """)
+        st.markdown(_DOC_CONTENTS_MD)
 
     else:
         # No document generated yet - show instructions
         st.info("👆 Configure options in the sidebar and click 'Generate Documentation'")
 
-        st.markdown("""
-        ## How to Generate Documentation
-
-        ### Step 1: Select Lineage Source
-        - **Use Existing Lineage**: If you just viewed lineage in the Lineage Analyzer page
-        - **Fetch New Lineage**: Select an object from cache or enter object ID manually
-
-        ### Step 2: Configure Content
-        - ✅ **Include Field Mappings**: Add detailed field information from CSN definitions
-        - ✅ **Include Transformation Logic**: Document transformation flows
-        - ⚪ **Transactional Only**: Focus only on data flows (exclude views/associations)
-
-        ### Step 3: Generate
-        - Click "Generate Documentation" button
-        - Wait for processing (may take 30-60 seconds for large lineages)
-        - Download the Word document
-
-        ### 💡 Tips
-        - **Field Mappings** require database access to fetch CSN definitions
-        - **Large lineages** (100+ objects) may take longer to process
-        - Documents can be customized in Word after generation
-        - Use **Transactional Only** for cleaner flow documentation
-
-        ### 🎯 Use Cases
-        - **Impact Analysis**: Document what would be affected by changing an object
-        - **Onboarding**: Help new team members understand data flows
-        - **Compliance**: Maintain audit trail of data lineage
-        - **Migration Planning**: Document dependencies before system changes
-        """)
+        st.markdown(_INSTRUCTIONS_MD)
 
         # Show example preview
         with st.expander("📖 Example Document Preview"):
@@ -6,8 +6,11 @@ and user-friendly error display throughout the application.
 """
 
 import logging
+import time
 import traceback
 import functools
+import itertools
+from collections import deque
 from typing import Callable, Any, Optional
 import streamlit as st
 
@@ -44,8 +47,15 @@ def display_error(
     if error and show_details:
         with st.expander("Technical Details"):
             st.code(str(error))
-            if hasattr(error, '__traceback__'):
-                st.code(traceback.format_exc())
+            # Format the exception's own traceback once and keep it on the error
+            formatted_tb = getattr(error, '_cached_tb', None)
+            if formatted_tb is None and error.__traceback__ is not None:
+                formatted_tb = ''.join(
+                    traceback.format_exception(type(error), error, error.__traceback__)
+                )
+                setattr(error, '_cached_tb', formatted_tb)
+            if formatted_tb:
+                st.code(formatted_tb)
 
 
 def display_warning(message: str):
@@ -92,7 +102,7 @@ def handle_errors(
                 return func(*args, **kwargs)
 
             except ConfigurationError as e:
-                logger.error(f"Configuration error in {func.__name__}: {e}")
+                logger.error("Configuration error in %s: %s", func.__name__, e)
                 display_error(
                     "Configuration Error: Please check your settings.",
                     error=e,
@@ -101,7 +111,7 @@ def handle_errors(
                 st.info("💡 Go to Settings page to configure the application.")
 
             except APIError as e:
-                logger.error(f"API error in {func.__name__}: {e}")
+                logger.error("API error in %s: %s", func.__name__, e)
 
                 # Provide specific guidance based on error
                 if e.status_code == 401:
@@ -134,7 +144,7 @@ def handle_errors(
                     )
 
             except DatabaseError as e:
-                logger.error(f"Database error in {func.__name__}: {e}")
+                logger.error("Database error in %s: %s", func.__name__, e)
                 display_error(
                     "Database Error: Failed to execute database query.",
                     error=e,
@@ -143,7 +153,7 @@ def handle_errors(
                 st.info("💡 Check your database connection settings.")
 
             except ValueError as e:
-                logger.error(f"Value error in {func.__name__}: {e}")
+                logger.error("Value error in %s: %s", func.__name__, e)
                 display_error(
                     f"Invalid input: {str(e)}",
                     error=e,
@@ -151,7 +161,7 @@ def handle_errors(
                 )
 
             except FileNotFoundError as e:
-                logger.error(f"File not found in {func.__name__}: {e}")
+                logger.error("File not found in %s: %s", func.__name__, e)
                 display_error(
                     f"File not found: {str(e)}",
                     error=e,
@@ -159,7 +169,7 @@ def handle_errors(
                 )
 
             except Exception as e:
-                logger.error(f"Unexpected error in {func.__name__}: {e}", exc_info=True)
+                logger.error("Unexpected error in %s: %s", func.__name__, e, exc_info=True)
                 display_error(
                     default_message,
                     error=e,
@@ -203,7 +213,7 @@ def safe_execute(
 
     except Exception as e:
         if log_errors:
-            logger.warning(f"{error_message}: {e}")
+            logger.warning("%s: %s", error_message, e)
 
         display_warning(error_message)
         return default_return
@@ -225,15 +235,15 @@ def require_config(config_keys: list) -> Callable:
         ...     # This will only run if config is set
         ...     pass
     """
+    keys_tuple = tuple(config_keys)
+
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            missing_keys = [
-                key for key in config_keys
-                if not st.session_state.get(key)
-            ]
-
-            if missing_keys:
+            session_get = st.session_state.get
+            # Common path: everything is configured, no list is built
+            if any(not session_get(key) for key in keys_tuple):
+                missing_keys = [key for key in keys_tuple if not session_get(key)]
                 st.warning(
                     f"⚠️ Configuration incomplete. Missing: {', '.join(missing_keys)}"
                 )
@@ -271,6 +281,15 @@ def with_spinner(message: str = "Loading...") -> Callable:
     return decorator
 
 
+# Activity log level -> icon shown in the sidebar
+_LEVEL_ICONS = {
+    'info': 'ℹ️',
+    'warning': '⚠️',
+    'error': '❌',
+    'success': '✅'
+}
+
+
 class ActivityLogger:
     """
     Simple activity logger for tracking user actions.
@@ -288,43 +307,45 @@ class ActivityLogger:
             level: Log level (info, warning, error, success)
         """
         if 'activity_log' not in st.session_state:
-            st.session_state['activity_log'] = []
+            # Bounded to the last 50 entries; older ones drop off on append
+            st.session_state['activity_log'] = deque(maxlen=50)
 
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        timestamp = time.strftime("%H:%M:%S")
 
         st.session_state['activity_log'].append({
             'timestamp': timestamp,
             'message': message,
             'level': level
         })
-
-        # Keep only last 50 entries
-        if len(st.session_state['activity_log']) > 50:
-            st.session_state['activity_log'] = st.session_state['activity_log'][-50:]
+        st.session_state['activity_log_version'] = st.session_state.get('activity_log_version', 0) + 1
 
         # Also log to file
-        logger.info(f"Activity: {message}")
+        logger.info("Activity: %s", message)
 
     @staticmethod
     def display():
         """Display activity log in sidebar."""
         if 'activity_log' in st.session_state and st.session_state['activity_log']:
-            with st.sidebar.expander("📋 Activity Log", expanded=False):
-                for entry in reversed(st.session_state['activity_log'][-10:]):
-                    icon = {
-                        'info': 'ℹ️',
-                        'warning': '⚠️',
-                        'error': '❌',
-                        'success': '✅'
-                    }.get(entry['level'], 'ℹ️')
+            # Streamlit needs the elements on every rerun, but the text is only
+            # re-formatted when the log changed since the last render
+            version = st.session_state.get('activity_log_version', 0)
+            rendered = st.session_state.get('_activity_log_rendered')
+            if not rendered or rendered[0] != version:
+                lines = [
+                    f"{entry['timestamp']} {_LEVEL_ICONS.get(entry['level'], 'ℹ️')} {entry['message']}"
+                    for entry in itertools.islice(reversed(st.session_state['activity_log']), 10)
+                ]
+                rendered = (version, "\n".join(lines))
+                st.session_state['_activity_log_rendered'] = rendered
 
-                    st.text(f"{entry['timestamp']} {icon} {entry['message']}")
+            with st.sidebar.expander("📋 Activity Log", expanded=False):
+                st.text(rendered[1])
 
     @staticmethod
     def clear():
         """Clear activity log."""
-        st.session_state['activity_log'] = []
+        st.session_state['activity_log'] = deque(maxlen=50)
+        st.session_state['activity_log_version'] = st.session_state.get('activity_log_version', 0) + 1
 
 
 def validate_input(
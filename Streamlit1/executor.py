@@ -0,0 +1,49 @@
+"""
+Bounded worker pools for concurrent Datasphere requests.
+
+Each fan-out gets its own small pool, so one large export can't queue
+ahead of other sessions' work, and its pending tasks are cancelled when
+the script run that started them is stopped or rerun.
+"""
+
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Concurrent requests per fan-out; several sessions together stay within the
+# utils.http_session connection pool (32)
+MAX_WORKERS_PER_CALL = 8
+
+
+@contextmanager
+def script_ctx_pool(task_count: int, max_workers: int = MAX_WORKERS_PER_CALL) -> Iterator[ThreadPoolExecutor]:
+    """
+    Thread pool for one fan-out of the current session.
+
+    Workers get the session's script context attached, so tasks can use
+    st.session_state and st elements like code on the script thread.
+    Leaving the block normally waits for all tasks; leaving it with an
+    exception (including Streamlit's rerun/stop) cancels tasks that have
+    not started yet.
+
+    Args:
+        task_count: Number of tasks that will be submitted
+        max_workers: Upper bound on worker threads
+
+    Yields:
+        ThreadPoolExecutor sized min(task_count, max_workers)
+    """
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, min(task_count, max_workers)),
+        thread_name_prefix="dsp-worker",
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    )
+    try:
+        yield pool
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
@@ -1,9 +1,12 @@
 import streamlit as st
-import requests
+from collections import deque
+from concurrent.futures import as_completed
+from itertools import islice
 from . import utils
-import json
+from . import executor as shared_executor
 import pandas as pd
 from datetime import datetime
+import hashlib
 import zipfile
 import io
 
@@ -41,11 +44,11 @@ def get_all_spaces():
     
     # Fallback without caching
     creds = get_credentials_from_session()
-    header = utils.initializeGetOAuthSession(creds['token'], creds['secret'])
+    header = utils.get_oauth_header(creds['token'], creds['secret'])
     url = utils.get_url(creds['dsp_host'], 'list_of_spaces')
     
     try:
-        response = requests.get(url, headers=header)
+        response = utils.http_session.get(url, headers=header, timeout=utils.HTTP_TIMEOUT)
         if response.status_code == 200:
             return response.json()
         else:
@@ -59,7 +62,11 @@ def get_all_spaces():
 def get_all_objects(space_id, limit=250):
     """Get all objects from a space using cache"""
     if CACHE_AVAILABLE and cm.CacheManager.is_cache_loaded():
-        # Get all cached objects and filter by space_id
+        # Filter the columnar copy of the cache by space_id
+        objects_frame = cm.get_all_objects_frame()
+        if objects_frame is not None:
+            return objects_frame[objects_frame['space_id'].eq(space_id)].head(limit).to_dict('records')
+        
         all_objects = cm.get_all_objects_cached()
         filtered = [obj for obj in all_objects if obj.get('space_id') == space_id]
         return filtered[:limit]
@@ -71,14 +78,14 @@ def get_all_objects(space_id, limit=250):
 def get_all_objects_direct(space_id, limit=250):
     """Fetch objects directly from API (used by cache and as fallback)"""
     creds = get_credentials_from_session()
-    header = utils.initializeGetOAuthSession(creds['token'], creds['secret'])
+    header = utils.get_oauth_header(creds['token'], creds['secret'])
     url = utils.get_url(creds['dsp_host'], 'all_design_objects').format(**{"spaceID": space_id})
 
     try:
-        response = requests.get(url, headers=header)
+        response = utils.http_session.get(url, headers=header, timeout=utils.HTTP_TIMEOUT)
 
         if response.status_code == 200:
-            data = response.json()
+            data = utils.json_loads(response.content)
             objects = data.get('results', [])
 
             if not objects:
@@ -117,160 +124,304 @@ def get_all_objects_direct(space_id, limit=250):
         return []
 
 
+
+def get_objects_for_spaces(space_ids, limit=250):
+    """
+    Fetch objects of several spaces concurrently (wall time ~ slowest space)
+
+    Returns a dict space_id -> object list, in the order of space_ids
+    """
+    results = {}
+    if not space_ids:
+        return results
+
+    progress_bar = st.progress(0)
+    total = len(space_ids)
+    with shared_executor.script_ctx_pool(total) as pool:
+        futures = {
+            pool.submit(get_all_objects_direct, space_id, limit): space_id
+            for space_id in space_ids
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            progress_bar.progress(done / total)
+    progress_bar.empty()
+
+    return {space_id: results[space_id] for space_id in space_ids}
+
+# Object kinds with a dedicated detail endpoint -> API type
+KIND_TO_API_TYPE = {
+    'sap.dwc.taskChain': 'taskchains',
+    'sap.dis.transformationflow': 'transformation_flows',
+    'sap.dis.dataflow': 'dataflows',
+    'sap.dis.replicationflow': 'replication_flows',
+}
+
+# Endpoints probed (in priority order) for objects of kind 'entity'
+ENTITY_API_TYPES = ('views', 'local_tables', 'remote_tables', 'analytic_models')
+
+# API type -> url.json endpoint key
+API_TYPE_TO_ENDPOINT = {
+    'views': 'view_detail',
+    'local_tables': 'local_table_detail',
+    'remote_tables': 'remote_table_detail',
+    'dataflows': 'data_flow_detail',
+    'analytic_models': 'analytic_model_detail',
+    'taskchains': 'task_chain_technical',
+    'replication_flows': 'replication_flow_detail',
+    'transformation_flows': 'transformation_flow_detail'
+}
+
+# API type -> name of the object placeholder in the endpoint URL
+API_TYPE_TO_PARAM = {
+    'views': 'view',
+    'local_tables': 'localtable',
+    'remote_tables': 'remotetables',
+    'dataflows': 'dataflow',
+    'analytic_models': 'analyticmodel',
+    'taskchains': 'technicalName',
+    'replication_flows': 'replicationflow',
+    'transformation_flows': 'technicalName'
+}
+
+# Concrete object kinds (lower-case) whose details are served by an entity endpoint
+ENTITY_KIND_TO_API_TYPE = {
+    'sap.dwc.view': 'views',
+    'sap.dwc.graphicalview': 'views',
+    'sap.dwc.sqlview': 'views',
+    'sap.dwc.localtable': 'local_tables',
+    'sap.dwc.remotetable': 'remote_tables',
+    'sap.dwc.analyticmodel': 'analytic_models',
+}
+
+ENTITY_TYPE_INDEX_KEY = '_entity_type_index'
+ENTITY_TYPE_CACHE_KEY = '_entity_type_cache'
+
+
+def _build_entity_type_index(objects_frame):
+    """Map (space_id, object_name) -> entity API type for cached objects with a concrete kind"""
+    api_types = objects_frame['object_type'].astype(str).str.lower().map(ENTITY_KIND_TO_API_TYPE)
+    known = objects_frame[api_types.notna()]
+    return dict(zip(zip(known['space_id'], known['object_name']), api_types[api_types.notna()]))
+
+
+def _get_entity_type_index():
+    """Entity type index of the loaded cache, rebuilt once per cache load"""
+    if not (CACHE_AVAILABLE and cm.CacheManager.is_cache_loaded()):
+        return {}
+
+    metadata = cm.CacheManager.get_cache_metadata()
+    stored = st.session_state.get(ENTITY_TYPE_INDEX_KEY)
+    if stored and stored[0] == metadata.timestamp:
+        return stored[1]
+
+    objects_frame = cm.get_all_objects_frame()
+    index = _build_entity_type_index(objects_frame) if objects_frame is not None else {}
+    st.session_state[ENTITY_TYPE_INDEX_KEY] = (metadata.timestamp, index)
+    return index
+
+
+def _get_entity_type_cache() -> dict[tuple[str, str, str], str]:
+    """Resolved API type of this session's 'entity' objects: (dsp_host, space_id, object_name) -> api type"""
+    if ENTITY_TYPE_CACHE_KEY not in st.session_state:
+        st.session_state[ENTITY_TYPE_CACHE_KEY] = {}
+    cache: dict[tuple[str, str, str], str] = st.session_state[ENTITY_TYPE_CACHE_KEY]
+    return cache
+
+
 def get_object_detail(space_id, object_name, object_type):
     """Get detailed JSON for a specific object"""
     creds = get_credentials_from_session()
-    header = utils.initializeGetOAuthSession(creds['token'], creds['secret'])
-    
-    # Map 'kind' values to specific API types
-    kind_to_api_type = {
-        'sap.dwc.taskChain': 'taskchains',
-        'sap.dis.transformationflow': 'transformation_flows',
-        'sap.dis.dataflow': 'dataflows',
-        'sap.dis.replicationflow': 'replication_flows',
-    }
+    header = utils.get_oauth_header(creds['token'], creds['secret'])
+    return _get_object_detail(creds, header, space_id, object_name, object_type)
+
+
+def _get_object_detail(creds, header, space_id, object_name, object_type):
+    """get_object_detail with credentials and header resolved once by the caller"""
+    dsp_host = creds['dsp_host']
     
-    # For 'entity' type, try to determine the actual type
+    # For 'entity' type, try to determine the actual type - probe the candidate
+    # endpoints in priority order and stop at the first hit ('views' answers
+    # most objects); the type index and the session's entity type cache skip
+    # most probes
     if object_type == 'entity':
-        for api_type in ['views', 'local_tables', 'remote_tables', 'analytic_models']:
-            detail = _try_fetch_object_detail(header, space_id, object_name, api_type)
+        entity_types = _get_entity_type_cache()
+        entity_key = (dsp_host, space_id, object_name)
+        # A concrete kind from the object cache saves probing every entity endpoint
+        known_type = entity_types.get(entity_key) or _get_entity_type_index().get((space_id, object_name))
+        if known_type:
+            detail = _try_fetch_object_detail(header, dsp_host, space_id, object_name, known_type)
+            if detail:
+                return detail
+        
+        for api_type in ENTITY_API_TYPES:
+            if api_type == known_type:
+                continue
+            detail = _try_fetch_object_detail(header, dsp_host, space_id, object_name, api_type)
             if detail:
+                entity_types[entity_key] = api_type
                 return detail
         return None
     
     # Map known types to API endpoints
-    api_type = kind_to_api_type.get(object_type)
+    api_type = KIND_TO_API_TYPE.get(object_type)
     if api_type:
-        return _try_fetch_object_detail(header, space_id, object_name, api_type)
+        return _try_fetch_object_detail(header, dsp_host, space_id, object_name, api_type)
     
-    # If we can't map the type, try to get the object using repository API
+    # If we can't map the type, look the object up in the space's repository listing
     try:
-        creds = get_credentials_from_session()
-        url = utils.get_url(creds['dsp_host'], 'all_design_objects').format(**{"spaceID": space_id})
-        response = requests.get(url, headers=header)
-        if response.status_code == 200:
-            data = response.json()
-            objects = data.get('results', [])
-            for obj in objects:
-                if obj.get('qualified_name') == object_name or obj.get('name') == object_name:
-                    return obj
-    except:
-        pass
-    return None
+        return _get_repository_index(dsp_host, _credential_key(creds), space_id, header).get(object_name)
+    except LookupError:
+        return None
+
+
+def _credential_key(creds):
+    """Digest of the OAuth client and token a cached listing is fetched with"""
+    return hashlib.sha256(f"{creds['client_id']}\0{creds['token']}".encode()).hexdigest()
+
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_repository_index(dsp_host, credential_key, space_id, _header):
+    """
+    Repository listing of a space indexed by qualified name and name
 
-def _try_fetch_object_detail(header, space_id, object_name, api_type):
+    Downloaded once per space instead of once per unmapped object. The
+    header is not hashed, so credential_key ties the listing to the
+    credentials it was fetched with. Raises LookupError on failure so a
+    failed download is not cached.
+    """
+    try:
+        url = utils.get_url(dsp_host, 'all_design_objects').format(**{"spaceID": space_id})
+        response = utils.http_session.get(url, headers=_header, timeout=utils.HTTP_TIMEOUT)
+    except Exception as e:
+        raise LookupError(f"Repository listing of {space_id} failed: {e}") from e
+    if response.status_code != 200:
+        raise LookupError(f"Repository listing of {space_id} failed: HTTP {response.status_code}")
+
+    index = {}
+    for obj in utils.json_loads(response.content).get('results', []):
+        for key in (obj.get('qualified_name'), obj.get('name')):
+            if key:
+                index.setdefault(key, obj)
+    return index
+
+
+def _try_fetch_object_detail(header, dsp_host, space_id, object_name, api_type):
     """Helper function to try fetching object details from a specific API endpoint"""
-    type_mapping = {
-        'views': 'view_detail',
-        'local_tables': 'local_table_detail',
-        'remote_tables': 'remote_table_detail',
-        'dataflows': 'data_flow_detail',
-        'analytic_models': 'analytic_model_detail',
-        'taskchains': 'task_chain_technical',
-        'replication_flows': 'replication_flow_detail',
-        'transformation_flows': 'transformation_flow_detail'
-    }
-    
-    param_mapping = {
-        'views': 'view',
-        'local_tables': 'localtable',
-        'remote_tables': 'remotetables',
-        'dataflows': 'dataflow',
-        'analytic_models': 'analyticmodel',
-        'taskchains': 'technicalName',
-        'replication_flows': 'replicationflow',
-        'transformation_flows': 'technicalName'
-    }
-    
-    endpoint_key = type_mapping.get(api_type)
+    endpoint_key = API_TYPE_TO_ENDPOINT.get(api_type)
     if not endpoint_key:
         return None
         
-    param_name = param_mapping.get(api_type, 'objectName')
+    param_name = API_TYPE_TO_PARAM.get(api_type, 'objectName')
 
     try:
-        creds = get_credentials_from_session()
-        url = utils.get_url(creds['dsp_host'], endpoint_key).format(
+        url = utils.get_url(dsp_host, endpoint_key).format(
             **{"spaceID": space_id, param_name: object_name}
         )
-        response = requests.get(url, headers=header)
+        response = utils.http_session.get(url, headers=header, timeout=utils.HTTP_TIMEOUT)
         if response.status_code == 200:
-            return response.json()
+            return utils.json_loads(response.content)
     except:
         pass
     
     return None
 
 
-def export_objects_to_json(selected_objects, export_format='separate'):
-    """Export selected objects to JSON format"""
-    exported_files = {}
+def stream_export_to_zip(selected_objects, export_format='separate'):
+    """
+    Export selected objects to JSON, writing each result straight into a ZIP
+
+    Details are fetched concurrently, but only a small window of requests is
+    in flight at a time and results are written in selection order as soon
+    as the oldest one finishes. Details are not cached, so memory stays
+    bounded by the window plus the compressed archive.
+    Returns (zip_buffer, exported_count).
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    zip_buffer = io.BytesIO()
+    exported_count = 0
+    written = set()
     
     progress_bar = st.progress(0)
     status_text = st.empty()
+    total = len(selected_objects)
     
-    for idx, obj in enumerate(selected_objects):
-        space_id = obj['space_id']
-        object_name = obj['object_name']
-        object_type = obj['object_type']
-        
-        status_text.text(f"Exporting {object_name} ({idx + 1}/{len(selected_objects)})...")
-        
-        json_data = get_object_detail(space_id, object_name, object_type)
+    # Resolve credentials and set up the session's entity type index and cache
+    # once here rather than in every worker
+    creds = get_credentials_from_session()
+    header = utils.get_oauth_header(creds['token'], creds['secret'])
+    _get_entity_type_index()
+    _get_entity_type_cache()
+    
+    # Fastest deflate level: indented JSON still compresses well, at a fraction of the CPU
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+        combined = None
+        if export_format == 'combined':
+            # One JSON object written member by member: {"<key>": <detail>, ...}
+            combined = zip_file.open(f"datasphere_export_{timestamp}.json", 'w')
+            combined.write(b'{\n')
         
-        if json_data:
-            if export_format == 'separate':
-                filename = f"{space_id}_{object_type}_{object_name}_{timestamp}.json"
-                exported_files[filename] = json_data
-            else:
-                key = f"{space_id}_{object_type}_{object_name}"
-                exported_files[key] = json_data
+        # Detail requests are network-bound - fetch them concurrently, keeping
+        # at most two requests per worker pending (the reorder buffer)
+        with shared_executor.script_ctx_pool(total) as pool:
+            window = 2 * shared_executor.MAX_WORKERS_PER_CALL
+            pending = deque()
+            remaining = iter(selected_objects)
+            
+            for done in range(1, total + 1):
+                for obj in islice(remaining, window - len(pending)):
+                    pending.append((obj, pool.submit(
+                        _get_object_detail, creds, header, obj['space_id'], obj['object_name'], obj['object_type']
+                    )))
+                
+                obj, future = pending.popleft()
+                json_data = future.result()
+                key = f"{obj['space_id']}_{obj['object_type']}_{obj['object_name']}"
+            
+                if json_data and key not in written:
+                    written.add(key)
+                    dumped = utils.json_dumps_indented(json_data)
+                    if combined is None:
+                        zip_file.writestr(f"{key}_{timestamp}.json", dumped)
+                    else:
+                        if exported_count:
+                            combined.write(b',\n')
+                        # Indent the member one level, as json.dumps(indent=2) nests it
+                        combined.write(b'  ' + utils.json_dumps_indented(key) + b': ' + dumped.replace(b'\n', b'\n  '))
+                    exported_count += 1
+            
+                status_text.text(f"Exported {obj['object_name']} ({done}/{total})...")
+                progress_bar.progress(done / total)
         
-        progress_bar.progress((idx + 1) / len(selected_objects))
+        if combined is not None:
+            combined.write(b'\n}\n')
+            combined.close()
     
     status_text.text("Export completed!")
     progress_bar.empty()
     
-    if export_format == 'combined':
-        combined_filename = f"datasphere_export_{timestamp}.json"
-        return {combined_filename: exported_files}
-    
-    return exported_files
-
-
-def create_zip_download(exported_files):
-    """Create a ZIP file containing all exported JSON files"""
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for filename, json_data in exported_files.items():
-            json_string = json.dumps(json_data, indent=2, ensure_ascii=False)
-            zip_file.writestr(filename, json_string)
-    
     zip_buffer.seek(0)
-    return zip_buffer
+    return zip_buffer, exported_count
 
 
 def get_objects_summary(selected_objects):
     """Create a summary DataFrame of selected objects"""
-    summary_data = []
-    
-    for obj in selected_objects:
-        summary_data.append({
-            'Space': obj['space_id'],
-            'Type': obj['object_type'],
-            'Technical Name': obj['object_name']
-        })
-    
-    return pd.DataFrame(summary_data)
+    return pd.DataFrame.from_records(
+        selected_objects,
+        columns=['space_id', 'object_type', 'object_name']
+    ).rename(columns={
+        'space_id': 'Space',
+        'object_type': 'Type',
+        'object_name': 'Technical Name'
+    })
 
 
 def get_unique_object_types(objects):
-    """Extract unique object types from the objects list for dynamic filtering"""
-    types = set()
-    for obj in objects:
-        types.add(obj.get('object_type', 'Unknown'))
+    """Extract unique object types from the objects list (or DataFrame) for dynamic filtering"""
+    frame = objects if isinstance(objects, pd.DataFrame) else pd.DataFrame.from_records(objects)
+    if frame.empty:
+        return []
+    if 'object_type' not in frame.columns:
+        return ['Unknown']
     
-    return sorted(list(types))
\ No newline at end of file
+    return sorted(frame['object_type'].fillna('Unknown').unique())
@@ -1,15 +1,19 @@
-import json
 import pandas as pd
 import streamlit as st
 from . import utils
 
-def get_csn_files():
-    # Get dsp_space from V2 app_config or V1 session state
+EXPOSED_VIEW_COLUMNS = ['Space', 'Object', 'Description', 'Exposed', 'DAC Item', 'DAC Object']
+
+def _get_connection_scope():
+    """Return (hdb_address, hdb_user, dsp_space) from V2 app_config or V1 session state"""
     if 'app_config' in st.session_state:
-        dsp_space = st.session_state['app_config'].dsp_space
-    else:
-        dsp_space = st.session_state.get('dsp_space')
+        config = st.session_state['app_config']
+        return config.hdb_address, config.hdb_user, config.dsp_space
+    return st.session_state.get('hdb_address'), st.session_state.get('hdb_user'), st.session_state.get('dsp_space')
 
+@st.cache_data(ttl=600, show_spinner=False)
+def _get_csn_files_cached(hdb_address, hdb_user, dsp_space):
+    """Latest tableFunction/InAModel CSNs of a space; cached per database user and space"""
     query = f'''
         SELECT A.ARTIFACT_NAME, A.CSN, A.ARTIFACT_VERSION
         FROM "{dsp_space}$TEC"."$$DEPLOY_ARTIFACTS$$" A
@@ -23,41 +27,44 @@ def get_csn_files():
         ON A.ARTIFACT_NAME = B.ARTIFACT_NAME
         AND A.ARTIFACT_VERSION = B.MAX_ARTIFACT_VERSION;
     '''
-    return utils.database_connection(query)
-
-def get_exposed_views():
-    # Get dsp_space from V2 app_config or V1 session state
-    if 'app_config' in st.session_state:
-        dsp_space = st.session_state['app_config'].dsp_space
-    else:
-        dsp_space = st.session_state.get('dsp_space')
+    csn_files = utils.database_connection(query)
+    if not csn_files:
+        # Raise so a failed or empty lookup is not cached
+        raise LookupError(f"No CSN files found in space {dsp_space}")
+    return csn_files
 
+def get_csn_files():
+    hdb_address, hdb_user, dsp_space = _get_connection_scope()
+    try:
+        return _get_csn_files_cached(hdb_address, hdb_user, dsp_space)
+    except LookupError:
+        return []
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _get_exposed_views_cached(hdb_address, hdb_user, dsp_space):
+    """Exposed views of a space with their DAC assignments; cached per database user and space"""
     exposedViews = []
-    dac_objects = []
-    dac_items = []
 
     # Get objects which are exposed
-    csn_files = get_csn_files()
+    csn_files = _get_csn_files_cached(hdb_address, hdb_user, dsp_space)
 
     for csn in csn_files:
-        csn = csn[1]
-        csn_loaded = json.loads(csn)
-        dac_objects.clear()
-        dac_items.clear()
+        csn_loaded = utils.json_loads(csn[1])
+        definitions = csn_loaded['definitions']
 
-        objectName = list(csn_loaded['definitions'].keys())[0]
-        label = csn_loaded['definitions'][objectName]['@EndUserText.label']
-        try:
-            exposed = csn_loaded['definitions'][objectName]['@DataWarehouse.consumption.external']
-        except KeyError:
-            exposed = False
+        objectName = next(iter(definitions))
+        definition = definitions[objectName]
+        label = definition['@EndUserText.label']
+        exposed = definition.get('@DataWarehouse.consumption.external', False)
 
         # Only process if the view is exposed
         if not exposed:
             continue
 
+        dac_items = []
+        dac_objects = []
         try:
-            for dac in csn_loaded['definitions'][objectName]['@DataWarehouse.dataAccessControl.usage']:
+            for dac in definition['@DataWarehouse.dataAccessControl.usage']:
 
                 if len(dac['on']) == 3: # one column mapping
                     dac_items.append(dac['on'][0]['ref'][0])
@@ -69,9 +76,32 @@ def get_exposed_views():
                 dac_objects.append(dac["target"])
 
         except KeyError:
-            dac_items.clear()
-            dac_objects.clear()
+            dac_items = []
+            dac_objects = []
+
+        exposedViews.append({
+            'Space': dsp_space,
+            'Object': objectName,
+            'Description': label,
+            'Exposed': exposed,
+            'DAC Item': dac_items,
+            'DAC Object': dac_objects
+        })
+
+    df = pd.DataFrame.from_records(exposedViews, columns=EXPOSED_VIEW_COLUMNS)
+    # Join the DAC lists column-wise instead of formatting every row
+    for column in ('DAC Item', 'DAC Object'):
+        df[column] = df[column].str.join(', ')
+    return df
 
-        exposedViews.append((dsp_space, objectName, label, exposed, ', '.join(f'{item}' for item in dac_items), ', '.join(f'{object}' for object in dac_objects)))
-
-    return pd.DataFrame(exposedViews, columns=['Space', 'Object', 'Description', 'Exposed', 'DAC Item', 'DAC Object'])
\ No newline at end of file
+def get_exposed_views():
+    hdb_address, hdb_user, dsp_space = _get_connection_scope()
+    try:
+        return _get_exposed_views_cached(hdb_address, hdb_user, dsp_space)
+    except LookupError:
+        return pd.DataFrame(columns=EXPOSED_VIEW_COLUMNS)
+
+def clear_cache():
+    """Drop cached CSN files and exposed views so the next lookup queries the database"""
+    _get_csn_files_cached.clear()
+    _get_exposed_views_cached.clear()
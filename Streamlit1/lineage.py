@@ -4,8 +4,9 @@ Lineage analysis and management for SAP Datasphere objects.
 Provides functions to fetch, parse, filter, and analyze object lineage.
 """
 
+import functools
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 from .models import AppConfig, LineageTree, LineageNode
 from .api_client import DataspherAPIClient
@@ -111,23 +112,29 @@ class LineageAnalyzer:
         Returns:
             Dictionary with analysis results
         """
-        all_objects = lineage_tree.get_all_objects()
-        object_count = len(all_objects)
-        type_counts = lineage_tree.count_by_type()
+        if lineage_tree._analysis is not None:
+            return lineage_tree._analysis
+
+        # Single pre-order walk collecting every statistic
+        object_count = 0
+        transactional_count = 0
+        max_depth = 0
+        type_counts: Dict[str, int] = {}
+        source_objects = []
+
+        for obj, depth in self._walk(lineage_tree.root):
+            object_count += 1
+            if obj.is_transactional():
+                transactional_count += 1
+            type_counts[obj.kind] = type_counts.get(obj.kind, 0) + 1
+            if depth > max_depth:
+                max_depth = depth
+            if not obj.dependencies:
+                # Source objects (no dependencies)
+                source_objects.append(obj)
 
-        # Count transactional vs non-transactional
-        transactional_count = sum(1 for obj in all_objects if obj.is_transactional())
         non_transactional_count = object_count - transactional_count
 
-        # Get dependency depth
-        max_depth = self._calculate_max_depth(lineage_tree.root)
-
-        # Identify source objects (no dependencies)
-        source_objects = [
-            obj for obj in all_objects
-            if not obj.dependencies
-        ]
-
         analysis = {
             'total_objects': object_count,
             'transactional_objects': transactional_count,
@@ -142,28 +149,25 @@ class LineageAnalyzer:
         }
 
         logger.info(f"Lineage analysis: {analysis}")
+        lineage_tree._analysis = analysis
         return analysis
 
-    def _calculate_max_depth(self, node: LineageNode, current_depth: int = 0) -> int:
+    @staticmethod
+    def _walk(root: LineageNode) -> Iterator[Tuple[LineageNode, int]]:
         """
-        Calculate maximum depth of lineage tree.
+        Iterate over a lineage tree in pre-order.
 
         Args:
-            node: Current node
-            current_depth: Current depth level
+            root: Node to start from
 
-        Returns:
-            Maximum depth
+        Yields:
+            Tuples of (node, depth) with the root at depth 0
         """
-        if not node.dependencies:
-            return current_depth
-
-        max_child_depth = current_depth
-        for dep in node.dependencies:
-            child_depth = self._calculate_max_depth(dep, current_depth + 1)
-            max_child_depth = max(max_child_depth, child_depth)
-
-        return max_child_depth
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            stack.extend((dep, depth + 1) for dep in reversed(node.dependencies))
 
     def get_lineage_path(
         self,
@@ -180,39 +184,25 @@ class LineageAnalyzer:
         Returns:
             List of nodes representing the path, or None if not found
         """
-        path = []
-        if self._find_path(lineage_tree.root, target_object_name, path):
-            return path
-        return None
-
-    def _find_path(
-        self,
-        node: LineageNode,
-        target_name: str,
-        path: List[LineageNode]
-    ) -> bool:
-        """
-        Recursive helper to find path to target object.
+        # Iterative pre-order search; parents are recorded so the path is
+        # rebuilt once at the end instead of copied at every level
+        parents: Dict[int, Optional[LineageNode]] = {}
+        stack: List[tuple] = [(lineage_tree.root, None)]
+        while stack:
+            node, parent = stack.pop()
+            parents[id(node)] = parent
+
+            if node.qualified_name == target_object_name or node.name == target_object_name:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[id(node)]
+                path.reverse()
+                return path
+
+            stack.extend((dep, node) for dep in reversed(node.dependencies))
 
-        Args:
-            node: Current node
-            target_name: Target object name
-            path: Current path (modified in place)
-
-        Returns:
-            True if target found in this branch
-        """
-        path.append(node)
-
-        if node.qualified_name == target_name or node.name == target_name:
-            return True
-
-        for dep in node.dependencies:
-            if self._find_path(dep, target_name, path):
-                return True
-
-        path.pop()
-        return False
+        return None
 
     def export_lineage_json(self, lineage_tree: LineageTree) -> Dict[str, Any]:
         """
@@ -225,34 +215,38 @@ class LineageAnalyzer:
             Dictionary representation
         """
         return {
-            'root': self._node_to_dict(lineage_tree.root),
+            'root': self._tree_to_dict(lineage_tree.root),
             'fetched_at': lineage_tree.fetched_at.isoformat(),
             'statistics': self.analyze_lineage(lineage_tree)
         }
 
-    def _node_to_dict(self, node: LineageNode) -> Dict[str, Any]:
+    def _tree_to_dict(self, root: LineageNode) -> Dict[str, Any]:
         """
-        Convert LineageNode to dictionary recursively.
+        Convert a lineage tree to nested dictionaries without recursion.
+
+        Nodes are emitted in reverse pre-order, so every child dictionary
+        exists before its parent collects it.
 
         Args:
-            node: Node to convert
+            root: Root node of the tree
 
         Returns:
-            Dictionary representation
+            Dictionary representation of the root, dependencies nested
         """
-        return {
-            'id': node.id,
-            'qualified_name': node.qualified_name,
-            'name': node.name,
-            'kind': node.kind,
-            'folder_id': node.folder_id,
-            'dependency_type': node.dependency_type,
-            'is_transactional': node.is_transactional(),
-            'dependencies': [
-                self._node_to_dict(dep)
-                for dep in node.dependencies
-            ]
-        }
+        nodes = [node for node, _ in self._walk(root)]
+        out: Dict[int, Dict[str, Any]] = {}
+        for node in reversed(nodes):
+            out[id(node)] = {
+                'id': node.id,
+                'qualified_name': node.qualified_name,
+                'name': node.name,
+                'kind': node.kind,
+                'folder_id': node.folder_id,
+                'dependency_type': node.dependency_type,
+                'is_transactional': node.is_transactional(),
+                'dependencies': [out[id(dep)] for dep in node.dependencies]
+            }
+        return out[id(root)]
 
     def get_dependency_summary(self, lineage_tree: LineageTree) -> List[Dict[str, Any]]:
         """
@@ -330,6 +324,31 @@ def get_source_systems(lineage_tree: LineageTree) -> List[str]:
     return source_objects
 
 
+@functools.lru_cache(maxsize=256)
+def _kind_category(kind: str) -> str:
+    """
+    Map an object kind to its categorize_lineage_objects category.
+
+    Resolved once per distinct kind; a tree only contains a handful.
+
+    Args:
+        kind: Object kind, e.g. sap.dis.replicationflow
+
+    Returns:
+        Category key
+    """
+    kind = kind.lower()
+    if 'replicationflow' in kind:
+        return 'replication_flows'
+    if 'transformationflow' in kind:
+        return 'transformation_flows'
+    if 'view' in kind:
+        return 'views'
+    if 'table' in kind:
+        return 'tables'
+    return 'other'
+
+
 def categorize_lineage_objects(lineage_tree: LineageTree) -> Dict[str, List[str]]:
     """
     Categorize lineage objects by type.
@@ -349,17 +368,6 @@ def categorize_lineage_objects(lineage_tree: LineageTree) -> Dict[str, List[str]
     }
 
     for obj in lineage_tree.get_all_objects():
-        kind = obj.kind.lower()
-
-        if 'replicationflow' in kind:
-            categories['replication_flows'].append(obj.qualified_name)
-        elif 'transformationflow' in kind:
-            categories['transformation_flows'].append(obj.qualified_name)
-        elif 'view' in kind:
-            categories['views'].append(obj.qualified_name)
-        elif 'table' in kind:
-            categories['tables'].append(obj.qualified_name)
-        else:
-            categories['other'].append(obj.qualified_name)
+        categories[_kind_category(obj.kind)].append(obj.qualified_name)
 
     return categories
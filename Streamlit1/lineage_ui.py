@@ -5,41 +5,89 @@ Provides interactive lineage analysis with filtering and export capabilities.
 """
 
 import streamlit as st
-import json
-from typing import Optional, List, Dict
+import html
+from collections import defaultdict, deque
+from typing import Optional, List, Dict, Tuple
+import numpy as np
 import pandas as pd
 
 from .models import AppConfig, LineageTree, LineageNode
 from .lineage import LineageAnalyzer, identify_data_flow_path, categorize_lineage_objects
 from .error_handler import handle_errors, display_success, display_info, display_warning, display_error, ActivityLogger
-from .cache_manager import CacheManager
+from .cache_manager import CacheManager, get_object_options
 from .config_manager_v2 import ConfigManager
+from . import utils
+
+# Session state keys of the per-view render caches (cleared on every fetch)
+LINEAGE_TABLE_CACHE_KEY = 'lineage_table_cache'
+LINEAGE_LEVELS_CACHE_KEY = 'lineage_levels_cache'
+DISPLAY_TREE_CACHE_KEY = 'lineage_display_tree_cache'
+
+
+def _records_to_columns(records: List[Dict]) -> Dict[str, list]:
+    """Transpose uniform row dicts into column lists for the column-wise DataFrame constructor."""
+    if not records:
+        return {}
+    return {key: [record[key] for record in records] for key in records[0]}
+
+
+def _has_associations(lineage_tree: LineageTree) -> bool:
+    """
+    Check whether any dependency in the tree is a csn.entity.association.
+
+    Stops at the first association found; trees that already passed the
+    transactional filter usually have none.
+
+    Args:
+        lineage_tree: LineageTree to scan
+
+    Returns:
+        True if filter_out_associations would drop anything
+    """
+    stack = [lineage_tree.root]
+    while stack:
+        node = stack.pop()
+        if any(dep.dependency_type == 'csn.entity.association' for dep in node.dependencies):
+            return True
+        stack.extend(node.dependencies)
+    return False
 
 
 def filter_out_associations(lineage_tree: LineageTree) -> LineageTree:
     """Remove csn.entity.association dependencies from tree."""
-    def filter_node(node: LineageNode) -> Optional[LineageNode]:
-        # Filter out association dependencies
-        filtered_deps = []
-        for dep in node.dependencies:
-            if dep.dependency_type != 'csn.entity.association':
-                filtered_dep = filter_node(dep)
-                if filtered_dep:
-                    filtered_deps.append(filtered_dep)
-
-        # Return node with filtered dependencies
-        return LineageNode(
-            id=node.id,
-            qualified_name=node.qualified_name,
-            name=node.name,
-            kind=node.kind,
-            folder_id=node.folder_id,
-            dependency_type=node.dependency_type,
-            hash=node.hash,
-            impact=node.impact,
-            lineage=node.lineage,
-            dependencies=filtered_deps
-        )
+    def filter_node(root: LineageNode) -> Optional[LineageNode]:
+        # Iterative post-order walk: a node is resolved once its children are.
+        # Keyed on the node instance - the same object id can appear with
+        # different subtrees, so only a shared instance may share its copy
+        copies: Dict[int, LineageNode] = {}
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in copies:
+                continue
+            if not children_done:
+                stack.append((node, True))
+                # Filter out association dependencies
+                stack.extend(
+                    (dep, False) for dep in node.dependencies
+                    if dep.dependency_type != 'csn.entity.association' and id(dep) not in copies
+                )
+                continue
+
+            filtered_deps = [
+                copies[id(dep)] for dep in node.dependencies
+                if dep.dependency_type != 'csn.entity.association'
+            ]
+
+            # Reuse the node when no dependency was dropped or copied below it;
+            # only nodes on a path to an association are copied
+            changed = len(filtered_deps) != len(node.dependencies) or any(
+                copy is not dep for copy, dep in zip(filtered_deps, node.dependencies)
+            )
+            copies[id(node)] = (
+                node.model_copy(update={'dependencies': filtered_deps}) if changed else node
+            )
+        return copies[id(root)]
 
     filtered_root = filter_node(lineage_tree.root)
     if filtered_root:
@@ -47,44 +95,62 @@ def filter_out_associations(lineage_tree: LineageTree) -> LineageTree:
     return lineage_tree
 
 
-def render_lineage_table(lineage_tree: LineageTree):
+def _build_lineage_table(lineage_tree: LineageTree) -> pd.DataFrame:
+    """
+    Build the lineage table: one row per unique object at its shallowest level.
+
+    Args:
+        lineage_tree: LineageTree to tabulate
+
+    Returns:
+        DataFrame with Level, Name, Type, Transactional, Dependency Type and ID
+    """
+    # Breadth-first walk: depths never decrease, so the first visit of an
+    # object is its shallowest occurrence and rows come out in flow order
+    levels, names, types, transactional, dep_types, ids = [], [], [], [], [], []
+    seen = set()
+    queue = deque([(lineage_tree.root, 0)])
+    while queue:
+        obj, depth = queue.popleft()
+        if obj.id in seen:
+            continue
+        seen.add(obj.id)
+
+        levels.append(depth)
+        names.append(obj.name)
+        types.append(obj.kind)
+        transactional.append('✅' if obj.is_transactional() else '❌')
+        dep_types.append(obj.dependency_type or 'Root')
+        ids.append(obj.id)
+
+        queue.extend((dep, depth + 1) for dep in obj.dependencies if dep.id not in seen)
+
+    return pd.DataFrame({
+        'Level': np.fromiter(levels, dtype=np.int32, count=len(levels)),
+        'Name': names,
+        'Type': types,
+        'Transactional': transactional,
+        'Dependency Type': dep_types,
+        'ID': ids
+    }, copy=False)
+
+
+def render_lineage_table(lineage_tree: LineageTree, cache_key: Optional[tuple] = None):
     """
     Render lineage as a flat table with deduplication and flow order.
 
     Args:
         lineage_tree: LineageTree to display
+        cache_key: Identifies the displayed view; when given, the table is
+            reused from session state across reruns with the same key
     """
-    def collect_with_depth(node: LineageNode, depth: int = 0) -> List[Dict]:
-        """Recursively collect nodes with depth level."""
-        results = [{'node': node, 'depth': depth}]
-        for dep in node.dependencies:
-            results.extend(collect_with_depth(dep, depth + 1))
-        return results
-
-    # Collect all nodes with depth
-    nodes_with_depth = collect_with_depth(lineage_tree.root)
-
-    # Deduplicate: keep shallowest occurrence of each unique object
-    unique_nodes = {}
-    for item in nodes_with_depth:
-        obj_id = item['node'].id
-        if obj_id not in unique_nodes or item['depth'] < unique_nodes[obj_id]['depth']:
-            unique_nodes[obj_id] = item
-
-    # Build table data
-    data = []
-    for item in sorted(unique_nodes.values(), key=lambda x: x['depth']):
-        obj = item['node']
-        data.append({
-            'Level': item['depth'],
-            'Name': obj.name,
-            'Type': obj.kind,
-            'Transactional': '✅' if obj.is_transactional() else '❌',
-            'Dependency Type': obj.dependency_type or 'Root',
-            'ID': obj.id
-        })
-
-    df = pd.DataFrame(data)
+    cached = st.session_state.get(LINEAGE_TABLE_CACHE_KEY)
+    if cache_key is not None and cached and cached[0] == cache_key:
+        df = cached[1]
+    else:
+        df = _build_lineage_table(lineage_tree)
+        if cache_key is not None:
+            st.session_state[LINEAGE_TABLE_CACHE_KEY] = (cache_key, df)
 
     # Column configuration
     column_config = {
@@ -100,65 +166,105 @@ def render_lineage_table(lineage_tree: LineageTree):
     st.caption(f"📊 Showing {len(df)} unique objects (ordered by flow: Query → Source)")
 
 
+# Node card icons: exact dependency types first, then substring matches
+_EXACT_ICONS = {
+    'csn.query.from': "📥",
+    'csn.entity.association': "🔗",
+}
+_SUBSTRING_ICONS = (
+    ('replicationflow', "🔄"),
+    ('transformationflow', "⚙️"),
+)
+
+# Card with border; flex item of the level row (three per row). Kept on one
+# line so cards joined into one markdown block stay a single HTML block
+_CARD_TPL = (
+    "<div style='flex: 1 1 30%; min-width: 0; border: 1px solid #ddd; padding: 10px; border-radius: 5px; margin: 5px 0;'>"
+    "<div style='font-size: 20px;'>{icon}</div>"
+    "<div style='font-weight: bold;'>{name}</div>"
+    "<div style='font-size: 12px; color: #666;'>{kind}</div>"
+    "<div style='font-size: 11px; color: #999;'>{dep}</div>"
+    "</div>"
+)
+
+
+def _node_card_html(node: LineageNode) -> str:
+    """Build the HTML of a compact card for a single node."""
+    # Icon based on dependency type
+    dependency_type = node.dependency_type or ''
+    icon = _EXACT_ICONS.get(dependency_type) or next(
+        (icon for part, icon in _SUBSTRING_ICONS if part in dependency_type), "📊"
+    )
+
+    return _CARD_TPL.format_map({
+        'icon': icon,
+        'name': html.escape(node.name),
+        'kind': html.escape(node.kind),
+        'dep': html.escape(node.dependency_type or 'Root'),
+    })
+
+
 def render_node_card(node: LineageNode):
     """Render a compact card for a single node."""
-    # Icon based on type
-    if node.dependency_type == 'csn.query.from':
-        icon = "📥"
-    elif 'replicationflow' in (node.dependency_type or ''):
-        icon = "🔄"
-    elif 'transformationflow' in (node.dependency_type or ''):
-        icon = "⚙️"
-    elif node.dependency_type == 'csn.entity.association':
-        icon = "🔗"
+    st.markdown(_node_card_html(node), unsafe_allow_html=True)
+
+
+def render_node_cards(nodes: List[LineageNode]):
+    """Render the cards of one level as a single flexbox row (one frontend message per level)."""
+    cards = "".join(_node_card_html(node) for node in nodes)
+    st.markdown(
+        f"<div style='display: flex; flex-wrap: wrap; gap: 8px;'>{cards}</div>",
+        unsafe_allow_html=True
+    )
+
+
+def render_flow_diagram(lineage_tree: LineageTree, max_depth: int = 10, cache_key: Optional[tuple] = None):
+    """Render lineage as a linear flow diagram: Query → Source (levels reused per cache_key)."""
+
+    def collect_by_level(root: LineageNode) -> Tuple[Dict[int, List[LineageNode]], bool]:
+        """
+        Group unique nodes by the shallowest depth level they occur at.
+
+        Nodes below max_depth are never visited; the flag tells whether the
+        lineage continues beyond it.
+        """
+        # Each object is expanded once per improvement of its depth, so shared
+        # subtrees of the DAG are not re-walked
+        shallowest: Dict[str, tuple] = {}
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if node.id in shallowest and shallowest[node.id][0] <= depth:
+                continue
+            shallowest[node.id] = (depth, node)
+            if depth < max_depth:
+                stack.extend((dep, depth + 1) for dep in reversed(node.dependencies))
+
+        levels: Dict[int, List[LineageNode]] = defaultdict(list)
+        for depth, node in shallowest.values():
+            levels[depth].append(node)
+
+        truncated = any(
+            dep.id not in shallowest
+            for node in levels.get(max_depth, [])
+            for dep in node.dependencies
+        )
+        # Plain dict, so later lookups can't add empty levels
+        return dict(levels), truncated
+
+    # Group objects by level (deduplicated across the whole lineage)
+    levels_key = (cache_key, max_depth)
+    cached = st.session_state.get(LINEAGE_LEVELS_CACHE_KEY)
+    if cache_key is not None and cached and cached[0] == levels_key:
+        levels, truncated = cached[1]
     else:
-        icon = "📊"
-
-    # Card with border
-    st.markdown(f"""
-    <div style='border: 1px solid #ddd; padding: 10px; border-radius: 5px; margin: 5px 0;'>
-        <div style='font-size: 20px;'>{icon}</div>
-        <div style='font-weight: bold;'>{node.name}</div>
-        <div style='font-size: 12px; color: #666;'>{node.kind}</div>
-        <div style='font-size: 11px; color: #999;'>{node.dependency_type or 'Root'}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-
-def render_flow_diagram(lineage_tree: LineageTree, max_depth: int = 10):
-    """Render lineage as a linear flow diagram: Query → Source."""
-
-    def collect_by_level(node: LineageNode, depth: int = 0) -> Dict[int, List[LineageNode]]:
-        """Group nodes by depth level."""
-        levels = {depth: [node]}
-        for dep in node.dependencies:
-            dep_levels = collect_by_level(dep, depth + 1)
-            for level, nodes in dep_levels.items():
-                if level in levels:
-                    levels[level].extend(nodes)
-                else:
-                    levels[level] = nodes
-        return levels
-
-    # Group objects by level
-    levels = collect_by_level(lineage_tree.root)
-
-    # Deduplicate within each level
-    for level, nodes in levels.items():
-        seen_ids = set()
-        unique = []
-        for node in nodes:
-            if node.id not in seen_ids:
-                seen_ids.add(node.id)
-                unique.append(node)
-        levels[level] = unique
+        levels, truncated = collect_by_level(lineage_tree.root)
+        if cache_key is not None:
+            st.session_state[LINEAGE_LEVELS_CACHE_KEY] = (levels_key, (levels, truncated))
 
     # Render each level
+    last_level = max(levels.keys())
     for level in sorted(levels.keys()):
-        if level > max_depth:
-            st.info(f"⚠️ Stopping at level {max_depth}. Use slider to show deeper levels.")
-            break
-
         nodes = levels[level]
 
         # Level header
@@ -167,24 +273,100 @@ def render_flow_diagram(lineage_tree: LineageTree, max_depth: int = 10):
         else:
             st.markdown(f"### {'⬇️' * min(level, 3)} Level {level} - {len(nodes)} object(s)")
 
-        # Show objects at this level in columns
+        # Show objects at this level side by side
         if len(nodes) <= 3:
-            cols = st.columns(len(nodes))
-            for idx, node in enumerate(nodes):
-                with cols[idx]:
-                    render_node_card(node)
+            render_node_cards(nodes)
         else:
             # Too many objects, use expander
             with st.expander(f"📦 {len(nodes)} objects at this level", expanded=level < 3):
-                cols = st.columns(min(3, len(nodes)))
-                for idx, node in enumerate(nodes):
-                    with cols[idx % 3]:
-                        render_node_card(node)
+                render_node_cards(nodes)
 
         # Arrow to next level
-        if level < max(levels.keys()) and level < max_depth:
+        if level < last_level:
             st.markdown("<div style='text-align: center; font-size: 24px; margin: 10px 0;'>⬇️</div>", unsafe_allow_html=True)
 
+    if truncated:
+        st.info(f"⚠️ Stopping at level {max_depth}. Use slider to show deeper levels.")
+
+
+def _get_display_tree(
+    lineage_tree: LineageTree,
+    show_transactional_only: bool,
+    show_associations: bool,
+    view_key: tuple
+) -> Tuple[LineageTree, Optional[int]]:
+    """
+    Apply the transactional and association filters, once per view.
+
+    The filtered tree is kept in session state, so reruns for the same view
+    reuse it together with the analysis LineageAnalyzer stores on it.
+
+    Args:
+        lineage_tree: Fetched lineage tree
+        show_transactional_only: Keep only transactional objects
+        show_associations: Keep csn.entity.association dependencies
+        view_key: Identifies the view (fetch, object and filter options)
+
+    Returns:
+        Tuple of (tree to display, object count of the transactional tree
+        or None if the filter is off or found no transactional objects)
+    """
+    stored = st.session_state.get(DISPLAY_TREE_CACHE_KEY)
+    if stored and stored[0] == view_key:
+        return stored[1], stored[2]
+
+    display_tree = lineage_tree
+    transactional_total = None
+    if show_transactional_only:
+        filtered_tree = lineage_tree.get_transactional_lineage()
+        if filtered_tree:
+            display_tree = filtered_tree
+            transactional_total = filtered_tree.count_objects()
+
+            # Further filter associations if needed (skipped when there are none)
+            if not show_associations and _has_associations(display_tree):
+                display_tree = filter_out_associations(display_tree)
+
+    st.session_state[DISPLAY_TREE_CACHE_KEY] = (view_key, display_tree, transactional_total)
+    return display_tree, transactional_total
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _find_object_id_cached(
+    tenant_key: tuple,
+    technical_name: str,
+    space_id: Optional[str],
+    _config: AppConfig
+) -> str:
+    """
+    Look up an object ID by technical name, cached per tenant.
+
+    Searching all spaces walks every space's object list, so a repeated
+    lookup of the same name (e.g. fetching again with other options) is
+    served from the cache. Misses raise and are therefore not cached.
+
+    Args:
+        tenant_key: (dsp_host, client_id); the config itself is not hashed
+        technical_name: Object technical name
+        space_id: Space to search, or None for all accessible spaces
+        _config: Application configuration used for the API calls
+
+    Returns:
+        Object ID
+
+    Raises:
+        LookupError: If the object was not found
+    """
+    from .api_client import DataspherAPIClient
+
+    object_id = DataspherAPIClient(_config).find_object_id_by_name(
+        technical_name=technical_name,
+        space_id=space_id
+    )
+    if not object_id:
+        raise LookupError(f"Object {technical_name} not found")
+    return object_id
+
 
 @handle_errors(show_traceback=True)
 def lineage_analyzer_page():
@@ -248,15 +430,12 @@ def lineage_analyzer_page():
             cached_objects = CacheManager.get_cached_objects()
 
             if cached_objects:
-                # Create dropdown options
-                object_options = {
-                    f"{obj.technical_name} ({obj.space_id})": obj
-                    for obj in cached_objects
-                }
+                # Create dropdown options (once per cache load)
+                labels, object_options = get_object_options('lineage_object_options', metadata, cached_objects)
 
                 selected_option = st.sidebar.selectbox(
                     "Select Object",
-                    options=list(object_options.keys()),
+                    options=labels,
                     help="Select an object from the cache"
                 )
 
@@ -355,19 +534,19 @@ def lineage_analyzer_page():
         if selection_method == "Manual Entry" and not object_id:
             with st.spinner(f"🔍 Looking up object: {object_name}..."):
                 try:
-                    from .api_client import DataspherAPIClient
                     from .documentation_helper import derive_space_from_object_name
 
                     # Try space derivation
                     derived_space, prefix = derive_space_from_object_name(object_name)
                     search_space = space_filter if space_filter else derived_space
 
-                    # Lookup ID via API
-                    api_client = DataspherAPIClient(config)
-                    object_id = api_client.find_object_id_by_name(
-                        technical_name=object_name,
-                        space_id=search_space
-                    )
+                    # Lookup ID via API (repeat lookups within 5 minutes are cached)
+                    try:
+                        object_id = _find_object_id_cached(
+                            (config.dsp_host, config.client_id), object_name, search_space, config
+                        )
+                    except LookupError:
+                        object_id = None
 
                     if not object_id:
                         st.error(f"❌ Object '{object_name}' not found in accessible spaces")
@@ -403,6 +582,9 @@ def lineage_analyzer_page():
                 # Store in session state
                 st.session_state['current_lineage'] = lineage_tree
                 st.session_state['lineage_object_name'] = object_name
+                st.session_state.pop(LINEAGE_TABLE_CACHE_KEY, None)
+                st.session_state.pop(LINEAGE_LEVELS_CACHE_KEY, None)
+                st.session_state.pop(DISPLAY_TREE_CACHE_KEY, None)
 
                 display_success(f"Lineage fetched successfully! Found {lineage_tree.count_objects()} objects.")
                 ActivityLogger.log(f"Fetched lineage for {object_name}", "success")
@@ -419,34 +601,34 @@ def lineage_analyzer_page():
 
         st.header(f"📊 Lineage for: {obj_name}")
 
-        # Apply transactional filter if needed
-        display_tree = lineage_tree
+        # Identifies the displayed tree for the render caches
+        view_key = (lineage_tree.fetched_at, obj_name, show_transactional_only, show_associations)
+
+        # Apply transactional filter if needed (the filtered tree, and the
+        # analysis stored on it, are reused across reruns of the same view)
+        display_tree, transactional_total = _get_display_tree(
+            lineage_tree, show_transactional_only, show_associations, view_key
+        )
         if show_transactional_only:
-            filtered_tree = lineage_tree.get_transactional_lineage()
-            if filtered_tree:
-                display_tree = filtered_tree
-                st.info(f"ℹ️ Showing only transactional objects: {display_tree.count_objects()} of {lineage_tree.count_objects()} total")
-
-                # Further filter associations if needed
-                if not show_associations:
-                    display_tree = filter_out_associations(display_tree)
+            if transactional_total is not None:
+                st.info(f"ℹ️ Showing only transactional objects: {transactional_total} of {lineage_tree.count_objects()} total")
             else:
                 st.warning("⚠️ No transactional objects found in lineage")
-                display_tree = lineage_tree
 
-        # Statistics
+        # Statistics - one walk of the tree, shared with the analysis section
+        analyzer = LineageAnalyzer(config)
+        analysis = analyzer.analyze_lineage(display_tree)
+
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            st.metric("Total Objects", display_tree.count_objects())
+            st.metric("Total Objects", analysis['total_objects'])
 
         with col2:
-            transactional_count = sum(1 for obj in display_tree.get_all_objects() if obj.is_transactional())
-            st.metric("Transactional", transactional_count)
+            st.metric("Transactional", analysis['transactional_objects'])
 
         with col3:
-            type_counts = display_tree.count_by_type()
-            st.metric("Object Types", len(type_counts))
+            st.metric("Object Types", len(analysis['object_type_counts']))
 
         with col4:
             metadata = CacheManager.get_cache_metadata()
@@ -456,9 +638,6 @@ def lineage_analyzer_page():
 
         # Analysis section
         with st.expander("📈 Detailed Analysis", expanded=False):
-            analyzer = LineageAnalyzer(config)
-            analysis = analyzer.analyze_lineage(display_tree)
-
             col1, col2 = st.columns(2)
 
             with col1:
@@ -478,7 +657,12 @@ def lineage_analyzer_page():
             # Source objects
             if analysis['source_objects']:
                 st.subheader("Source Objects (Leaf Nodes)")
-                source_df = pd.DataFrame(analysis['source_objects'])
+                # A shared source appears once per path; list each object once
+                unique_sources = list({
+                    (source['name'], source['kind']): source
+                    for source in analysis['source_objects']
+                }.values())
+                source_df = pd.DataFrame(unique_sources)
                 st.dataframe(source_df, hide_index=True, use_container_width=True)
 
         # Display lineage
@@ -487,11 +671,11 @@ def lineage_analyzer_page():
         if display_mode in ["Flow Diagram", "Both"]:
             st.subheader("🌊 Data Flow Diagram")
             with st.container():
-                render_flow_diagram(display_tree, max_depth=max_depth)
+                render_flow_diagram(display_tree, max_depth=max_depth, cache_key=view_key)
 
         if display_mode in ["Table View", "Both"]:
             st.subheader("📋 Table View")
-            render_lineage_table(display_tree)
+            render_lineage_table(display_tree, cache_key=view_key)
 
         # Export section
         st.markdown("---")
@@ -499,48 +683,40 @@ def lineage_analyzer_page():
 
         col1, col2, col3 = st.columns(3)
 
+        # Serialized only when a download button is clicked, not on every rerun
+        def transactional_export() -> bytes:
+            if show_transactional_only:
+                return utils.json_dumps_indented(analyzer.export_lineage_json(display_tree))
+            filtered = lineage_tree.get_transactional_lineage()
+            if filtered:
+                return utils.json_dumps_indented(analyzer.export_lineage_json(filtered))
+            return utils.json_dumps_indented({"message": "No transactional objects found"})
+
         with col1:
             # Export full lineage as JSON
-            analyzer = LineageAnalyzer(config)
-            json_data = analyzer.export_lineage_json(display_tree)
-            json_str = json.dumps(json_data, indent=2)
-
             st.download_button(
                 label="📄 Download Full Lineage (JSON)",
-                data=json_str,
+                data=lambda: utils.json_dumps_indented(analyzer.export_lineage_json(display_tree)),
                 file_name=f"lineage_{obj_name}_{display_tree.fetched_at.strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
 
         with col2:
             # Export dependency summary as CSV
-            summary = analyzer.get_dependency_summary(display_tree)
-            summary_df = pd.DataFrame(summary)
-            csv = summary_df.to_csv(index=False)
-
             st.download_button(
                 label="📊 Download Summary (CSV)",
-                data=csv,
+                data=lambda: pd.DataFrame(
+                    _records_to_columns(analyzer.get_dependency_summary(display_tree)), copy=False
+                ).to_csv(index=False),
                 file_name=f"lineage_summary_{obj_name}.csv",
                 mime="text/csv"
             )
 
         with col3:
             # Export transactional lineage only
-            if show_transactional_only:
-                transactional_json = analyzer.export_lineage_json(display_tree)
-            else:
-                filtered = lineage_tree.get_transactional_lineage()
-                if filtered:
-                    transactional_json = analyzer.export_lineage_json(filtered)
-                else:
-                    transactional_json = {"message": "No transactional objects found"}
-
-            trans_json_str = json.dumps(transactional_json, indent=2)
-
             st.download_button(
                 label="🔄 Download Transactional Only (JSON)",
-                data=trans_json_str,
+                data=transactional_export,
                 file_name=f"lineage_transactional_{obj_name}.json",
                 mime="application/json"
             )
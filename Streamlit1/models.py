@@ -5,9 +5,11 @@ This module contains Pydantic models for type safety, validation,
 and structured data handling throughout the application.
 """
 
+import functools
+from collections import Counter
 from typing import Optional, List, Dict, Any, Literal, ClassVar
 from datetime import datetime
-from pydantic import BaseModel, Field, validator, ConfigDict
+from pydantic import BaseModel, Field, PrivateAttr, validator, ConfigDict
 from enum import Enum
 
 
@@ -103,26 +105,39 @@ class CSNElement(BaseModel):
         Returns:
             CSNElement instance
         """
-        # Extract label
-        label = csn_data.get('@EndUserText.label')
-
-        # Extract association
-        association_data = csn_data.get('@ObjectModel.foreignKey.association', {})
-        association = association_data.get('=') if isinstance(association_data, dict) else None
-
-        # Extract semantics
-        semantics = {
-            k: v for k, v in csn_data.items()
-            if k.startswith('@Semantics.')
-        }
-
-        return cls(
+        # Single pass over the element: plain fields, association and
+        # semantic annotations are picked up together
+        label = None
+        type_ = 'unknown'
+        length = None
+        key = False
+        not_null = False
+        association = None
+        semantics = {}
+        for k, v in csn_data.items():
+            if k == '@EndUserText.label':
+                label = v
+            elif k == 'type':
+                type_ = v
+            elif k == 'length':
+                length = v
+            elif k == 'key':
+                key = v
+            elif k == 'notNull':
+                not_null = v
+            elif k == '@ObjectModel.foreignKey.association':
+                association = v.get('=') if isinstance(v, dict) else None
+            elif k.startswith('@Semantics.'):
+                semantics[k] = v
+
+        # Built from our own parsed CSN, so field validation is skipped
+        return cls.model_construct(
             technical_name=technical_name,
             label=label,
-            type=csn_data.get('type', 'unknown'),
-            length=csn_data.get('length'),
-            key=csn_data.get('key', False),
-            not_null=csn_data.get('notNull', False),
+            type=type_,
+            length=length,
+            key=key,
+            not_null=not_null,
             association=association,
             semantics=semantics
         )
@@ -163,7 +178,8 @@ class CSNDefinition(BaseModel):
             for elem_name, elem_data in elements_data.items()
         ]
 
-        return cls(
+        # Elements are already models; skip re-validating the definition
+        return cls.model_construct(
             object_name=object_name,
             kind=csn_data.get('kind', 'unknown'),
             label=label,
@@ -188,7 +204,7 @@ class LineageNode(BaseModel):
     dependencies: List['LineageNode'] = Field(default_factory=list, description="Child dependencies")
 
     # Transactional dependency types (main data flow)
-    TRANSACTIONAL_DEPENDENCY_TYPES: ClassVar[set] = {
+    TRANSACTIONAL_DEPENDENCY_TYPES: ClassVar[frozenset] = frozenset({
         'csn.query.from',                          # Main query/view source (PRIMARY!)
         'sap.dis.replicationflow.source',          # Replication source
         'sap.dis.replicationflow.targetOf',        # Replication target
@@ -197,15 +213,28 @@ class LineageNode(BaseModel):
         'sap.dis.target',                          # Data flow target
         'sap.dis.source',                          # Data flow source
         'sap.dis.targetOf',                        # Target reference
-    }
+    })
 
     # Dimensional dependency types (reference/lookup data)
-    DIMENSIONAL_DEPENDENCY_TYPES: ClassVar[set] = {
+    DIMENSIONAL_DEPENDENCY_TYPES: ClassVar[frozenset] = frozenset({
         'csn.entity.association',                  # Foreign key association
         'csn.valueHelp.entity',                    # Value help/dropdown
         'csn.derivation.lookupEntity',             # Lookup entity
         'sap.dwc.idtEntity',                       # IDT entity reference
-    }
+    })
+
+    # Object kinds treated as transactional for root nodes / unknown dependency types
+    ROOT_TRANSACTIONAL_KINDS: ClassVar[frozenset] = frozenset({
+        'sap.dis.replicationflow',
+        'sap.dis.transformationflow',
+        'sap.dwc.dataflow',
+        'sap.dwc.localtable',
+    })
+    TRANSACTIONAL_KINDS: ClassVar[frozenset] = frozenset({
+        'sap.dis.replicationflow',
+        'sap.dis.transformationflow',
+        'sap.dwc.dataflow',
+    })
 
     def is_transactional(self) -> bool:
         """
@@ -223,15 +252,14 @@ class LineageNode(BaseModel):
         Returns:
             True if transactional data flow, False if dimensional/reference
         """
+        return self._transactional
+
+    @functools.cached_property
+    def _transactional(self) -> bool:
+        """is_transactional result, computed once per node (depends only on kind and dependency_type)."""
         # Root node (no dependency type): check object kind
         if not self.dependency_type:
-            transactional_kinds = {
-                'sap.dis.replicationflow',
-                'sap.dis.transformationflow',
-                'sap.dwc.dataflow',
-                'sap.dwc.localtable'
-            }
-            return self.kind in transactional_kinds
+            return self.kind in self.ROOT_TRANSACTIONAL_KINDS
 
         # Primary check: dependency type (MOST IMPORTANT!)
         if self.dependency_type in self.TRANSACTIONAL_DEPENDENCY_TYPES:
@@ -241,13 +269,7 @@ class LineageNode(BaseModel):
             return False
 
         # Fallback: check object kind for unknown dependency types
-        transactional_kinds = {
-            'sap.dis.replicationflow',
-            'sap.dis.transformationflow',
-            'sap.dwc.dataflow'
-        }
-
-        return self.kind in transactional_kinds
+        return self.kind in self.TRANSACTIONAL_KINDS
 
     def get_all_nodes(self) -> List['LineageNode']:
         """
@@ -256,16 +278,21 @@ class LineageNode(BaseModel):
         Returns:
             Flat list of all nodes
         """
-        nodes = [self]
-        for dep in self.dependencies:
-            nodes.extend(dep.get_all_nodes())
+        # Explicit stack instead of recursion; children are pushed reversed
+        # so nodes come out in the same pre-order as before
+        nodes: List['LineageNode'] = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(node.dependencies))
         return nodes
 
     def filter_transactional(self) -> Optional['LineageNode']:
         """
         Filter lineage tree to only transactional (data flow) dependencies.
 
-        Recursively follows ONLY transactional dependency chains (csn.query.from),
+        Follows ONLY transactional dependency chains (csn.query.from),
         excluding dimensional associations, value helps, and lookup entities.
 
         This accurately identifies the main data flow path from source to destination.
@@ -273,55 +300,41 @@ class LineageNode(BaseModel):
         Returns:
             New LineageNode with only transactional descendants, or None if no transactional path
         """
-        # Recursively filter child dependencies
-        # KEY CHANGE: Only recurse into transactional dependencies!
-        filtered_deps = []
-        for dep in self.dependencies:
-            # Check if dependency is transactional BEFORE recursing
-            if dep.is_transactional():
-                filtered_dep = dep.filter_transactional()
-                if filtered_dep:
-                    filtered_deps.append(filtered_dep)
-
-        # Root node: always include if has transactional descendants
-        if not self.dependency_type:
-            if filtered_deps:
-                return LineageNode(
-                    id=self.id,
-                    qualified_name=self.qualified_name,
-                    name=self.name,
-                    kind=self.kind,
-                    folder_id=self.folder_id,
-                    dependency_type=self.dependency_type,
-                    hash=self.hash,
-                    impact=self.impact,
-                    lineage=self.lineage,
-                    dependencies=filtered_deps
-                )
-            return None
-
-        # Child nodes: include if transactional OR has transactional descendants
-        if self.is_transactional() or filtered_deps:
-            return LineageNode(
-                id=self.id,
-                qualified_name=self.qualified_name,
-                name=self.name,
-                kind=self.kind,
-                folder_id=self.folder_id,
-                dependency_type=self.dependency_type,
-                hash=self.hash,
-                impact=self.impact,
-                lineage=self.lineage,
-                dependencies=filtered_deps
+        # Iterative post-order walk (no recursion frame per node): a node is
+        # resolved once all of its transactional dependencies are
+        filtered: Dict[int, Optional['LineageNode']] = {}
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                # KEY CHANGE: Only descend into transactional dependencies!
+                stack.extend((dep, False) for dep in node.dependencies if dep.is_transactional())
+                continue
+
+            # Non-transactional dependencies were never pushed, so they are
+            # absent here; is_transactional is evaluated once per dependency
+            filtered_deps = [
+                filtered[id(dep)] for dep in node.dependencies
+                if filtered.get(id(dep)) is not None
+            ]
+
+            # Keep nodes with transactional descendants; child nodes are also
+            # kept when transactional themselves (root nodes only with descendants)
+            keep = bool(filtered_deps) or (bool(node.dependency_type) and node.is_transactional())
+            filtered[id(node)] = (
+                node.model_copy(update={'dependencies': filtered_deps}) if keep else None
             )
 
-        return None
+        return filtered[id(self)]
 
 
 class LineageTree(BaseModel):
     """Represents the complete lineage tree for an object."""
     root: LineageNode = Field(..., description="Root node of lineage tree")
     fetched_at: datetime = Field(default_factory=datetime.now, description="When lineage was fetched")
+    # Statistics computed by LineageAnalyzer.analyze_lineage, kept with the tree
+    _analysis: Optional[Dict[str, Any]] = PrivateAttr(default=None)
 
     def get_all_objects(self) -> List[LineageNode]:
         """Get flat list of all objects in lineage."""
@@ -334,16 +347,48 @@ class LineageTree(BaseModel):
             return LineageTree(root=filtered_root, fetched_at=self.fetched_at)
         return None
 
+    @functools.cached_property
+    def unique_objects(self) -> List[LineageNode]:
+        """
+        Objects in depth-first order, each object ID only once.
+
+        Shared objects (e.g. a dimension used by several views) appear once per
+        reference in the tree; their repeated subtrees are skipped here.
+
+        Returns:
+            Flat list of distinct nodes
+        """
+        seen = set()
+        nodes: List[LineageNode] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.id in seen:
+                continue
+            seen.add(node.id)
+            nodes.append(node)
+            stack.extend(reversed(node.dependencies))
+        return nodes
+
+    @functools.cached_property
+    def object_count(self) -> int:
+        """Total objects in lineage, computed once (the tree is not modified after fetching)."""
+        return len(self.get_all_objects())
+
     def count_objects(self) -> int:
         """Count total objects in lineage."""
-        return len(self.get_all_objects())
+        return self.object_count
 
     def count_by_type(self) -> Dict[str, int]:
         """Count objects by type."""
-        counts: Dict[str, int] = {}
-        for node in self.get_all_objects():
-            counts[node.kind] = counts.get(node.kind, 0) + 1
-        return counts
+        # Counted during the walk, without building the flat object list
+        counts: Counter = Counter()
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            counts[node.kind] += 1
+            stack.extend(reversed(node.dependencies))
+        return dict(counts)
 
 
 class AppConfig(BaseModel):
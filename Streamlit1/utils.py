@@ -1,9 +1,13 @@
+import functools
 import json
+import orjson
 from . import dsp_token
 from json.decoder import JSONDecodeError
 from datetime import datetime, timedelta
 from hdbcli import dbapi
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
 
 # Import cache manager and config helpers
@@ -22,6 +26,42 @@ except ImportError:
         }
 
 
+def json_loads(data):
+    """Parse JSON text or bytes (orjson)"""
+    return orjson.loads(data)
+
+
+def json_dumps_indented(data) -> bytes:
+    """Serialize data to 2-space indented UTF-8 JSON bytes (orjson)"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
+# (connect, read) timeout in seconds for calls through http_session
+HTTP_TIMEOUT = (3.05, 30)
+
+
+def _create_http_session():
+    """Create a pooled requests session so repeated calls reuse TCP/TLS connections."""
+    session = requests.Session()
+    # Retry transient gateway/throttling responses too; the last response is
+    # returned (not raised) so callers keep their status-code handling
+    retry_strategy = Retry(
+        total=2,
+        backoff_factor=0.2,
+        allowed_methods=["GET"],
+        status_forcelist=[429, 502, 503, 504],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry_strategy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session for direct Datasphere REST calls
+http_session = _create_http_session()
+
+
 def get_url(dsp_url, url_name):
     f = open('url.json')
     urls = json.load(f)
@@ -60,6 +100,25 @@ def initializeGetOAuthSession(token_file, secrets_file):
     return header
 
 
+@functools.lru_cache(maxsize=8)
+def _cached_oauth_header(token, secret):
+    """Build the OAuth GET header once per (token, secret) pair."""
+    return initializeGetOAuthSession(token, secret)
+
+
+def get_oauth_header(token, secret):
+    """
+    Get the OAuth GET header, reusing it while the access token is unchanged
+
+    V2 passes the access token string itself, so a refreshed token is a new
+    cache key. V1 token files/dicts may trigger a token refresh and are
+    therefore never cached.
+    """
+    if isinstance(token, str) and not token.endswith('.json'):
+        return dict(_cached_oauth_header(token, secret))
+    return initializeGetOAuthSession(token, secret)
+
+
 def initializePutOAuthSession(token_file, secrets_file):
     # Handle both V2 (string token) and V1 (dict token) formats
     if isinstance(token_file, str) and not token_file.endswith('.json'):
@@ -107,11 +166,11 @@ def get_space_business_names():
     # This function is called by cache_manager as a fallback
     # It should NOT call cache_manager to avoid infinite recursion
     creds = get_credentials_from_session()
-    header = initializeGetOAuthSession(creds['token'], creds['secret'])
+    header = get_oauth_header(creds['token'], creds['secret'])
     url = get_url(creds['dsp_host'], "spaces_name")
 
     try:
-        response = requests.get(url, headers=header)
+        response = http_session.get(url, headers=header, timeout=HTTP_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             data = data['results']
@@ -124,7 +183,8 @@ def get_space_business_names():
         return {}
 
 
-def database_connection(query):
+def database_connection(query, params=None):
+    """Run a query (optionally with ? bind params) and return all rows; [] on failure"""
     try:
         # Get database credentials from V2 or V1 config
         if 'app_config' in st.session_state:
@@ -148,7 +208,10 @@ def database_connection(query):
             password=password
         )
         cursor = conn.cursor()
-        cursor.execute(query)
+        if params is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query, params)
         rows = cursor.fetchall()
         conn.close()
         return rows
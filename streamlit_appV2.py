@@ -177,7 +177,14 @@ def exposed_views_gui():
     st.markdown("Find views which are exposed for consumption and check if they have a Data Access Control assigned.")
     with st.container(width=2000, border=True):
         st.session_state.dsp_space = selectbox_space()
-        if st.button('Get Exposed Views'):
+        col_get, col_refresh = st.columns([1, 1])
+        with col_get:
+            get_views = st.button('Get Exposed Views')
+        with col_refresh:
+            if st.button('🔄 Refresh', help="Reload CSN files from the database instead of the 10-minute cache"):
+                exposed_views.clear_cache()
+                get_views = True
+        if get_views:
             with st.spinner("Wait for it...", show_time=True):
                 st.session_state.df = exposed_views.get_exposed_views()    
                 st.session_state.display = not st.session_state.df.empty
@@ -285,8 +292,8 @@ def export_json_gui():
         # Load objects for selected spaces
         all_objects = []
         with st.spinner(f"Loading objects from {len(selected_spaces)} space(s)..."):
-            for space in selected_spaces:
-                objs = export_objects.get_all_objects_direct(space, limit=250)
+            objects_by_space = export_objects.get_objects_for_spaces(selected_spaces, limit=250)
+            for objs in objects_by_space.values():
                 all_objects.extend(objs)
         
         st.success(f"Loaded {len(all_objects)} objects from {len(selected_spaces)} space(s)")
@@ -360,11 +367,10 @@ def export_json_gui():
                                 and o['object_type'] == row['object_type'] and o['technicalName'] == row['technicalName']]
                         selected_objs.extend(match)
                     
-                    files = export_objects.export_objects_to_json(selected_objs, format_choice)
-                    if files:
-                        zip_buf = export_objects.create_zip_download(files)
+                    zip_buf, exported = export_objects.stream_export_to_zip(selected_objs, format_choice)
+                    if exported:
                         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        st.success(f"✅ Exported {len(files)} file(s)!")
+                        st.success(f"✅ Exported {exported} object(s)!")
                         st.download_button("📥 Download ZIP", data=zip_buf, 
                             file_name=f"datasphere_export_{ts}.zip", mime="application/zip")
 